@@ -3,8 +3,14 @@ from bs4 import BeautifulSoup
 import csv
 import json
 import logging
+import os
+import sys
 from datetime import datetime
 from urllib.parse import urlparse
+from functools import lru_cache
+# Article lives with the main scraper; share it rather than keeping a copy here
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Project Scraper"))
+from article import Article, KeywordMatcher, unique_articles
 
 # --- Configuration ---
 CONFIG = {}
@@ -17,6 +23,7 @@ except FileNotFoundError:
 
 # --- Global Variables ---
 KEYWORDS = CONFIG.get("KEYWORDS", [])
+KEYWORD_MATCHER = KeywordMatcher(KEYWORDS)
 
 # --- Logging Setup ---
 timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -38,6 +45,7 @@ headers = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36"
 }
 
+@lru_cache(maxsize=None)
 def get_source_name(url):
     """Extract the source name from a URL."""
     domain = urlparse(url).netloc
@@ -61,11 +69,14 @@ def fetch_articles(url):
                 title = link.text.strip()
                 href = link.get('href')
                 if title and href:
-                    if any(keyword.lower() in title.lower() for keyword in KEYWORDS):
+                    keyword_mask = KEYWORD_MATCHER.match(title)
+                    if keyword_mask:
                         # Ensure full URLs for links
                         if href.startswith('/'):
                             href = url.rstrip('/') + href
-                        articles.append({"title": title, "link": href, "source": get_source_name(url)})
+                        article = Article(title, href, get_source_name(url))
+                        article.keyword_mask = keyword_mask
+                        articles.append(article)
                     else:
                         logging.info(f"Filtered out by keyword: {title}")
                 else:
@@ -83,31 +94,21 @@ def save_to_csv(articles, filename):
         logging.warning("No articles to save to CSV.")
         return
 
-    unique_articles = []
-    seen = set()
-
-    for article in articles:
-        identifier = (article["title"], article["link"])
-        if identifier not in seen:
-            unique_articles.append(article)
-            seen.add(identifier)
-        else:
-            logging.info(f"Duplicate article skipped: {article['title']}")
-
+    articles = unique_articles(articles)
     # Log unique articles count before saving
-    logging.info(f"Number of unique articles: {len(unique_articles)}")
+    logging.info(f"Number of unique articles: {len(articles)}")
 
     with open(filename, mode="w", newline="", encoding="utf-8") as file:
         writer = csv.writer(file)
         writer.writerow(["Publisher_Name", "Headline_Title", "Link"])
-        for article in unique_articles:
-            logging.info(f"Saving article: {article['source']} - {article['title']}")  # Log each article being saved
+        for article in articles:
+            logging.info(f"Saving article: {article.source} - {article.title}")  # Log each article being saved
             writer.writerow([
-                article["source"],
-                article["title"],
-                f'=HYPERLINK("{article["link"]}", "Link")'  # Display "Link" as the clickable URL
+                article.source,
+                article.title,
+                f'=HYPERLINK("{article.link}", "Link")'  # Display "Link" as the clickable URL
             ])
-    logging.info(f"Saved {len(unique_articles)} articles to {filename}")
+    logging.info(f"Saved {len(articles)} articles to {filename}")
 
 def main():
     logging.info("Starting article scraping...")
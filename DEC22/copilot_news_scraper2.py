@@ -3,8 +3,14 @@ from bs4 import BeautifulSoup
 import csv
 import json
 import logging
+import os
+import sys
 from datetime import datetime
 from urllib.parse import urlparse
+from functools import lru_cache
+# Article lives with the main scraper; share it rather than keeping a copy here
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Project Scraper"))
+from article import Article, KeywordMatcher
 
 # --- Configuration ---
 CONFIG = {}
@@ -17,6 +23,7 @@ except FileNotFoundError:
 
 # --- Global Variables ---
 KEYWORDS = CONFIG.get("KEYWORDS", [])
+KEYWORD_MATCHER = KeywordMatcher(KEYWORDS)
 
 # --- Logging Setup ---
 timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -40,19 +47,21 @@ headers = {
 
 # --- Persistent Storage for Seen Articles ---
 def load_seen_articles(filename="seen_articles.json"):
-    """Load previously seen articles from a JSON file."""
+    """Load the IDs of previously seen articles from a JSON file."""
     try:
         with open(filename, "r") as file:
-            return set(json.load(file))  # Load as a set for fast lookups
+            # Older files held [title, link] pairs; those entries are dropped
+            return {item for item in json.load(file) if isinstance(item, int)}
     except FileNotFoundError:
         logging.info(f"{filename} not found. Starting fresh.")
         return set()  # Return an empty set if the file doesn't exist
 
 def save_seen_articles(seen_articles, filename="seen_articles.json"):
-    """Save seen articles to a JSON file."""
+    """Save seen article IDs to a JSON file."""
     with open(filename, "w") as file:
         json.dump(list(seen_articles), file)  # Convert set to list for JSON serialization
 
+@lru_cache(maxsize=None)
 def get_source_name(url):
     """Extract the source name from a URL."""
     domain = urlparse(url).netloc
@@ -76,11 +85,14 @@ def fetch_articles(url):
                 title = link.text.strip()
                 href = link.get('href')
                 if title and href:
-                    if any(keyword.lower() in title.lower() for keyword in KEYWORDS):
+                    keyword_mask = KEYWORD_MATCHER.match(title)
+                    if keyword_mask:
                         # Ensure full URLs for links
                         if href.startswith('/'):
                             href = url.rstrip('/') + href
-                        articles.append({"title": title, "link": href, "source": get_source_name(url)})
+                        article = Article(title, href, get_source_name(url))
+                        article.keyword_mask = keyword_mask
+                        articles.append(article)
                     else:
                         logging.info(f"Filtered out by keyword: {title}")
                 else:
@@ -100,10 +112,9 @@ def save_to_csv(articles, filename, seen_articles):
 
     new_articles = []
     for article in articles:
-        identifier = (article["title"], article["link"])  # Use a tuple as a unique identifier
-        if identifier not in seen_articles:
+        if article.id not in seen_articles:
             new_articles.append(article)
-            seen_articles.add(identifier)  # Add to the seen list
+            seen_articles.add(article.id)  # Add to the seen list
 
     if not new_articles:
         logging.info("No new articles found. Nothing to save.")
@@ -113,11 +124,11 @@ def save_to_csv(articles, filename, seen_articles):
         writer = csv.writer(file)
         writer.writerow(["Publisher_Name", "Headline_Title", "Link"])
         for article in new_articles:
-            logging.info(f"Saving article: {article['source']} - {article['title']}")  # Log each saved article
+            logging.info(f"Saving article: {article.source} - {article.title}")  # Log each saved article
             writer.writerow([
-                article["source"],
-                article["title"],
-                f'=HYPERLINK("{article["link"]}", "Link")'
+                article.source,
+                article.title,
+                f'=HYPERLINK("{article.link}", "Link")'
             ])
     logging.info(f"Saved {len(new_articles)} new articles to {filename}")
 
@@ -0,0 +1,129 @@
+import json
+import logging
+import re
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlparse
+
+MIN_SUPPORT = 2       # A path pattern must lead to at least this many distinct article paths
+MIN_PRECISION = 0.6   # ...and most links matching it must look like articles
+DATE_PATH = re.compile(r"/\d{4}/\d{1,2}/")
+SLUG_PATTERN = r"[a-z0-9]+(?:-[a-z0-9]+){2,}(?:\.html?)?"  # Three or more hyphenated words
+SLUG = re.compile(f"^{SLUG_PATTERN}$", re.I)
+
+def segment_pattern(segment):
+    """Generalize one URL path segment into a regex fragment."""
+    if segment.isdigit():
+        if len(segment) == 4:
+            return r"\d{4}"
+        if len(segment) <= 2:
+            return r"\d{1,2}"
+        return r"\d+"
+    if SLUG.match(segment):
+        # The slug shape itself, so /featured or /sign-in don't match a learned /<slug>
+        return SLUG_PATTERN
+    return re.escape(segment.lower())
+
+def path_template(path):
+    """Return the regex template for a URL path, e.g. /2024/12/20/some-story/ -> \\d{4}/..."""
+    segments = [segment for segment in path.split("/") if segment]
+    return "/" + "/".join(segment_pattern(segment) for segment in segments)
+
+def is_literal(template):
+    """Return True if a template matches only one path (no generalized segment)."""
+    return "\\d" not in template and SLUG_PATTERN not in template
+
+def same_host(host, other):
+    """Compare two hosts, ignoring case and a leading "www."."""
+    return host.lower().removeprefix("www.") == other.lower().removeprefix("www.")
+
+def looks_like_article(path, title, keywords_lower):
+    """Guess whether a link is an article: date-stamped or slugged path, or a keyword hit.
+
+    A keyword in the title only counts when the path has a generalized
+    segment (an ID, date or slug); otherwise /tag/<keyword> style section
+    links would be learned as article patterns.
+    """
+    segments = [segment for segment in path.split("/") if segment]
+    if DATE_PATH.search(path) or (segments and SLUG.match(segments[-1])):
+        return True
+    if is_literal(path_template(path)):
+        return False
+    title = title.lower()
+    return any(keyword in title for keyword in keywords_lower)
+
+class ExtractionProfile:
+    """Learned article-link patterns and DOM positions for one host."""
+
+    def __init__(self, patterns, positions, host=None):
+        self.host = host
+        self.patterns = patterns
+        self.positions = set(positions)
+        self.regex = re.compile("^(?:" + "|".join(patterns) + ")/?$", re.I) if patterns else None
+
+    def accepts(self, href, position):
+        """Return True if an anchor is worth parsing as an article candidate."""
+        if position not in self.positions or self.regex is None:
+            return False
+        parts = urlparse(href)
+        if parts.netloc and self.host and not same_host(parts.netloc, self.host):
+            return False
+        return self.regex.match(parts.path or "/") is not None
+
+# --- Persistent Profiles ---
+def load_profiles(filename="extraction_profiles.json"):
+    """Load per-host extraction profiles from a JSON file."""
+    try:
+        with open(filename, "r") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        logging.info(f"{filename} not found. Starting fresh.")
+        return {}
+
+def save_profiles(profiles, filename="extraction_profiles.json"):
+    """Save per-host extraction profiles to a JSON file."""
+    with open(filename, "w") as file:
+        json.dump(profiles, file, indent=4)
+
+def get_profile(profiles, host, relearn_days=14):
+    """Return the compiled profile for a host, or None if it must be (re)learned."""
+    entry = profiles.get(host)
+    if not entry or entry.get("stale") or time.time() - entry.get("learned", 0) > relearn_days * 86400:
+        return None
+    if any("[^/]+" in pattern for pattern in entry["patterns"]):
+        return None  # Learned before slugs kept their shape; it matched any one-segment path
+    return ExtractionProfile(entry["patterns"], entry["positions"], host)
+
+def learn_profile(links, keywords, host=None):
+    """Learn path patterns and DOM positions from (title, href, position) anchors of a full parse.
+
+    Links to other hosts are ignored. Returns a profile entry, or None when
+    the page gave too little to learn from.
+    """
+    keywords_lower = [keyword.lower() for keyword in keywords]
+    samples = []
+    template_paths = defaultdict(set)   # template -> distinct article paths
+    template_hits = Counter()
+    template_totals = Counter()
+    for title, href, position in links:
+        if not title or not href:
+            continue
+        parts = urlparse(href)
+        if parts.netloc and host and not same_host(parts.netloc, host):
+            continue
+        path = parts.path or "/"
+        template = path_template(path)
+        is_article = looks_like_article(path, title, keywords_lower)
+        samples.append((template, position, is_article))
+        template_totals[template] += 1
+        if is_article:
+            template_hits[template] += 1
+            template_paths[template].add(path.rstrip("/").lower())
+
+    patterns = {template for template, paths in template_paths.items()
+                if len(paths) >= MIN_SUPPORT and template_hits[template] / template_totals[template] >= MIN_PRECISION}
+    if not patterns:
+        return None
+    positions = {position for template, position, is_article in samples if is_article and template in patterns}
+    return {"patterns": sorted(patterns), "positions": sorted(positions),
+            "learned": time.time(), "samples": len(samples)}
@@ -0,0 +1,170 @@
+import codecs
+import logging
+import re
+import time
+from html.parser import HTMLParser
+
+import requests
+
+CHARSET_HEADER = re.compile(r"charset=[\"']?([\w.:-]+)", re.I)
+CHARSET_META = re.compile(rb"<meta[^>]+charset=[\"']?([\w.:-]+)", re.I)
+SNIFF_BYTES = 1024  # HTML requires the meta charset within the first 1024 bytes
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+CONTAINER_TAGS = {"h2", "h3", "article", "header"}
+
+class ArticleLinkParser(HTMLParser):
+    """Incrementally collect links inside headings, articles and headers.
+
+    Covers the same ground as the "h2 a", "h3 a", "article a",
+    "div.article a" and "header a" selectors, but can be fed the page
+    chunk by chunk while it downloads. Each anchor is reported once, in
+    document order, with its position: the innermost matching container
+    ("h2", "div.article", ...). An optional ``link_filter(href, position)``
+    rejects anchors before their text is collected.
+    """
+
+    def __init__(self, link_filter=None):
+        super().__init__(convert_charrefs=True)
+        self.links = []         # (title, href, position) inside an article container
+        self.first_link = None  # First (title, href) anywhere, for the fallback
+        self.rejected = 0       # Container anchors skipped by link_filter
+        self.link_filter = link_filter
+        self._stack = []        # (tag, container label or None) for open elements
+        self._containers = []   # Labels of the open containers, innermost last
+        self._anchor = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+        attrs = dict(attrs)
+        if tag == "a":
+            href = attrs.get("href")
+            position = self._containers[-1] if self._containers else None
+            self._anchor = {"href": href, "text": [], "position": position}
+            if position and href and self.link_filter and not self.link_filter(href, position):
+                self.rejected += 1
+                self._anchor["position"] = None  # Still usable as the fallback link
+        if tag in CONTAINER_TAGS:
+            label = tag
+        elif tag == "div" and "article" in (attrs.get("class") or "").split():
+            label = "div.article"
+        else:
+            label = None
+        self._stack.append((tag, label))
+        if label:
+            self._containers.append(label)
+
+    def handle_data(self, data):
+        if self._anchor is not None and (self._anchor["position"] or self.first_link is None):
+            self._anchor["text"].append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._anchor is not None:
+            anchor, self._anchor = self._anchor, None
+            title = "".join(anchor["text"]).strip()
+            if anchor["href"]:
+                if self.first_link is None:
+                    self.first_link = (title, anchor["href"])
+                if anchor["position"]:
+                    self.links.append((title, anchor["href"], anchor["position"]))
+        # Pop back to the matching open tag; stray end tags are ignored
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index][0] == tag:
+                for _, label in self._stack[index:]:
+                    if label:
+                        self._containers.pop()
+                del self._stack[index:]
+                break
+
+def declared_charset(content_type):
+    """Return the charset from a Content-Type header, if any."""
+    match = CHARSET_HEADER.search(content_type or "")
+    return match.group(1) if match else None
+
+def make_decoder(charset):
+    """Return an incremental decoder for a charset, falling back to UTF-8."""
+    try:
+        return codecs.getincrementaldecoder(charset)(errors="replace")
+    except LookupError:
+        logging.warning(f"Unknown charset {charset!r}. Decoding as UTF-8.")
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+def decode_chunks(chunks, content_type="", parser=None, max_bytes=2_000_000, deadline=None, url=""):
+    """Decode a page body arriving as byte chunks, feeding the text to ``parser``.
+
+    The body is decoded with the charset from the Content-Type header or
+    the page's <meta charset>, defaulting to UTF-8, without running any
+    statistical charset detection. Reading stops at ``max_bytes`` or once
+    ``deadline`` seconds have passed. Returns (text, truncated).
+    """
+    started = time.monotonic()
+    pieces = []
+    truncated = False
+    received = 0
+    charset = declared_charset(content_type)
+    decoder = make_decoder(charset) if charset else None
+    head = b""
+
+    def emit(data, final=False):
+        text = decoder.decode(data, final)
+        if text:
+            pieces.append(text)
+            if parser is not None:
+                parser.feed(text)
+
+    for chunk in chunks:
+        received += len(chunk)
+        if received > max_bytes:
+            chunk = chunk[:max(0, len(chunk) - (received - max_bytes))]
+        if decoder is None:
+            # Hold back the first bytes until we can look for <meta charset>
+            head += chunk
+            if len(head) < SNIFF_BYTES and received < max_bytes:
+                continue
+            match = CHARSET_META.search(head[:SNIFF_BYTES])
+            decoder = make_decoder(match.group(1).decode("ascii") if match else "utf-8")
+            chunk, head = head, b""
+        emit(chunk)
+        if received >= max_bytes:
+            logging.warning(f"Stopped reading {url} at the {max_bytes}-byte cap.")
+            truncated = True
+            break
+        if deadline is not None and time.monotonic() - started > deadline:
+            logging.warning(f"Stopped reading {url} after the {deadline}s deadline.")
+            truncated = True
+            break
+
+    if decoder is None:
+        # Short page: never reached SNIFF_BYTES
+        match = CHARSET_META.search(head)
+        decoder = make_decoder(match.group(1).decode("ascii") if match else "utf-8")
+    emit(head, final=True)
+    if parser is not None:
+        parser.close()
+    return "".join(pieces), truncated
+
+def fetch_streaming(url, headers=None, max_bytes=2_000_000, deadline=20, parser=None, chunk_size=16384,
+                    record=None):
+    """Download a page in chunks, stopping at a byte cap or a total-time deadline.
+
+    Decoded text is fed to ``parser`` as it arrives (see ``decode_chunks``).
+    When ``record`` is given, the raw bytes read are passed to it as
+    ``record("page", url, body, content_type)`` so the page can be replayed
+    offline. Returns (text, truncated).
+    """
+    raw = []
+
+    def tee(chunks):
+        for chunk in chunks:
+            raw.append(chunk)
+            yield chunk
+
+    with requests.get(url, headers=headers, stream=True, timeout=(5, deadline)) as response:
+        response.raise_for_status()
+        content_type = response.headers.get("Content-Type", "")
+        chunks = response.iter_content(chunk_size=chunk_size)
+        text, truncated = decode_chunks(tee(chunks) if record else chunks, content_type, parser,
+                                        max_bytes, deadline, url)
+    if record is not None:
+        record("page", url, b"".join(raw), content_type)
+    return text, truncated
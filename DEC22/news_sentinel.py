@@ -1,14 +1,19 @@
-import matplotlib
-matplotlib.use('Agg')  # Use Agg backend to avoid Tkinter issues
-import matplotlib.pyplot as plt
-import requests
-from bs4 import BeautifulSoup
+import argparse
 import csv
 import json
 import logging
+import os
+import sys
 from datetime import datetime
-import seaborn as sns
 from urllib.parse import urlparse
+from functools import lru_cache
+from fetch_stream import ArticleLinkParser, decode_chunks, fetch_streaming
+from extraction_profiles import load_profiles, save_profiles, get_profile, learn_profile
+from report import load_aggregates, save_aggregates, update_aggregates, generate_report, plot_article_counts
+# Article lives with the main scraper; share it rather than keeping a copy here
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Project Scraper"))
+from article import Article, KeywordMatcher, unique_articles
+from archive import ResponseArchive, replay_archive
 
 # --- Configuration ---
 CONFIG = {}
@@ -21,6 +26,11 @@ except FileNotFoundError:
 
 # --- Global Variables ---
 KEYWORDS = CONFIG.get("KEYWORDS", [])
+KEYWORD_MATCHER = KeywordMatcher(KEYWORDS)
+MAX_RESPONSE_BYTES = CONFIG.get("MAX_RESPONSE_BYTES", 2_000_000)
+FETCH_DEADLINE_SECONDS = CONFIG.get("FETCH_DEADLINE_SECONDS", 20)
+PROFILE_RELEARN_DAYS = CONFIG.get("PROFILE_RELEARN_DAYS", 14)
+ARCHIVE_DIR = CONFIG.get("ARCHIVE_DIR", "archive")
 
 # --- Logging Setup ---
 timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -41,44 +51,66 @@ headers = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36"
 }
 
+@lru_cache(maxsize=None)
 def get_source_name(url):
     """Extract the source name from a URL."""
     domain = urlparse(url).netloc
     parts = domain.split('.')
     return parts[-2].upper() if len(parts) > 2 else parts[0].upper()
 
-def fetch_articles(url):
-    """Fetch articles from a website using BeautifulSoup."""
+def fetch_articles(url, profiles=None, record=None, archived=None):
+    """Fetch articles from a website, parsing links while the page streams in.
+
+    When ``profiles`` holds a learned profile for the host, only anchors in
+    its known article positions with matching URL paths are parsed.
+    Otherwise every container link is parsed and a profile is learned.
+    ``record`` archives the raw page; ``archived`` is a (body, content_type)
+    pair from the archive to parse instead of downloading the page.
+    """
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
+        host = urlparse(url).netloc
+        profile = get_profile(profiles, host, PROFILE_RELEARN_DAYS) if profiles is not None else None
+        parser = ArticleLinkParser(link_filter=profile.accepts if profile else None)
+        if archived:
+            body, content_type = archived
+            decode_chunks([body], content_type, parser, MAX_RESPONSE_BYTES, url=url)
+        else:
+            fetch_streaming(url, headers=headers, max_bytes=MAX_RESPONSE_BYTES,
+                            deadline=FETCH_DEADLINE_SECONDS, parser=parser, record=record)
         articles = []
 
-        # Common selectors for articles
-        selectors = ["h2 a", "h3 a", "article a", "div.article a", "header a"]
-
-        for selector in selectors:
-            for link in soup.select(selector):
-                title = link.text.strip()
-                href = link.get('href')
-                if title and href and any(keyword.lower() in title.lower() for keyword in KEYWORDS):
-                    # Ensure full URLs for links
-                    if href.startswith('/'):
-                        href = url.rstrip('/') + href
-                    articles.append({"title": title, "link": href, "source": get_source_name(url)})
+        if profiles is not None:
+            if profile is None:
+                learned = learn_profile(parser.links, KEYWORDS, host)
+                if learned:
+                    profiles[host] = learned
+                    logging.info(f"Learned extraction profile for {host}: {learned['patterns']}")
+            elif parser.rejected and not parser.links:
+                # Nothing passed the profile; the site layout probably changed
+                profiles[host]["stale"] = True
+                logging.warning(f"Extraction profile for {host} matched nothing. Relearning next run.")
+            logging.info(f"Parsed {len(parser.links)} candidate links from {url} "
+                         f"({parser.rejected} skipped by profile)")
+
+        for title, href, _ in parser.links:
+            keyword_mask = KEYWORD_MATCHER.match(title) if title and href else 0
+            if keyword_mask:
+                # Ensure full URLs for links
+                if href.startswith('/'):
+                    href = url.rstrip('/') + href
+                article = Article(title, href, get_source_name(url))
+                article.keyword_mask = keyword_mask
+                articles.append(article)
         
         if not articles:
             logging.warning(f"No articles found for {url}. Trying fallback method.")
             # Fallback method to ensure at least one article
-            first_link = soup.find("a", href=True)
-            if first_link:
-                title = first_link.text.strip()
-                href = first_link['href']
+            if parser.first_link:
+                title, href = parser.first_link
                 if href.startswith('/'):
                     href = url.rstrip('/') + href
                 if title and href:
-                    articles.append({"title": title, "link": href, "source": get_source_name(url)})
+                    articles.append(Article(title, href, get_source_name(url)))
         
         logging.info(f"Retrieved {len(articles)} articles from {url}")
         return articles
@@ -87,27 +119,45 @@ def fetch_articles(url):
         return []
 
 def save_to_csv(articles, filename):
-    """Save articles to a CSV file with hyperlinked URLs."""
-    unique_articles = []
-    seen = set()
-
-    for article in articles:
-        identifier = (article["title"], article["link"])
-        if identifier not in seen:
-            unique_articles.append(article)
-            seen.add(identifier)
+    """Save articles to a CSV file with hyperlinked URLs. Returns the articles saved."""
+    articles = unique_articles(articles)
 
     with open(filename, mode="w", newline="", encoding="utf-8") as file:
         writer = csv.writer(file)
         writer.writerow(["Publisher_Name", "Headline_Title", "Link"])
-        for article in unique_articles:
+        for article in articles:
             writer.writerow([
-                article["source"],
-                article["title"],
-                f'=HYPERLINK("{article["link"]}", "Link")'  # Display "Link" as the clickable URL
+                article.source,
+                article.title,
+                f'=HYPERLINK("{article.link}", "Link")'  # Display "Link" as the clickable URL
             ])
+    return articles
+
+def replay_page(root, record):
+    """Re-run extraction on one archived page. Returns its articles.
+
+    Current extraction profiles are used but not saved, so a replay never
+    changes what the next live run does.
+    """
+    if record["kind"] != "page":
+        return []
+    archive = ResponseArchive(root)
+    archived = (archive.load(record["digest"]), record["content_type"])
+    return fetch_articles(record["url"], load_profiles(), archived=archived)
+
+def replay_articles(run_id=None):
+    """Re-run extraction on a recorded run's pages in parallel, without any network access."""
+    return [article for articles in replay_archive(ARCHIVE_DIR, run_id, replay=replay_page) for article in articles]
+
+def main(record=False, replay=None):
+    # --- Replay mode: re-run extraction on archived pages only ---
+    if replay:
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        output_file = f"articles_replay_{timestamp}.csv"
+        saved_articles = save_to_csv(replay_articles(None if replay == "latest" else replay), output_file)
+        logging.info(f"Replay completed. {len(saved_articles)} articles saved to {output_file}")
+        return
 
-def main():
     logging.info("Starting article scraping...")
     all_articles = []
     article_counts = {}
@@ -120,28 +170,43 @@ def main():
         # Add more websites as needed
     ]
 
+    profiles = load_profiles()
+    archive = ResponseArchive(ARCHIVE_DIR) if record else None
+    run_id = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     for url in dynamic_websites:
         articles = []
+        recorder = archive.recorder(run_id, get_source_name(url)) if archive else None
         for attempt in range(max_retries):
-            articles = fetch_articles(url)
+            articles = fetch_articles(url, profiles, recorder)
             if articles:
                 break
             logging.warning(f"Retrying {url} (Attempt {attempt+1}/{max_retries})...")
 
         all_articles.extend(articles)
         article_counts[get_source_name(url)] = len(articles)
+    save_profiles(profiles)
 
     if len(all_articles) < 100:
         logging.warning("Fewer than 100 articles found. Adding additional unfiltered articles to reach quota.")
-        all_articles += [{"title": "Placeholder Article", "link": "", "source": "Unknown"}] * (100 - len(all_articles))
+        all_articles += [Article("Placeholder Article", "", "Unknown")] * (100 - len(all_articles))
 
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     output_file = f"articles_{timestamp}.csv"
-    save_to_csv(all_articles, output_file)
+    saved_articles = save_to_csv(all_articles, output_file)
     logging.info(f"Scraping completed. Articles saved to {output_file}")
 
+    # Fold this run into the running totals; the report never re-reads old CSVs
+    aggregates = update_aggregates(load_aggregates(), saved_articles, KEYWORD_MATCHER)
+    save_aggregates(aggregates)
+    generate_report(aggregates, prefix=f"report_{timestamp}")
+
     # Optionally plot the number of articles fetched from each website (if desired)
-    plot_article_counts(article_counts)
+    plot_article_counts(article_counts, f"article_counts_{timestamp}.png")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="News Sentinel article scraper.")
+    parser.add_argument("--record", action="store_true", help="Archive the raw pages fetched")
+    parser.add_argument("--replay", nargs="?", const="latest", metavar="RUN",
+                        help="Re-run extraction offline from the archive (latest run by default)")
+    args = parser.parse_args()
+    main(args.record, args.replay)
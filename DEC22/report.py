@@ -0,0 +1,137 @@
+import matplotlib
+matplotlib.use('Agg')  # Render charts headlessly
+import matplotlib.pyplot as plt
+import json
+import logging
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+WINDOW_DAYS = 90  # Days kept day-by-day; older days are folded into the all-time totals
+
+# --- Running Aggregates ---
+def empty_aggregates():
+    return {"totals": {"sources": {}, "keywords": {}, "articles": 0}, "days": {}}
+
+def load_aggregates(filename="report_aggregates.json"):
+    """Load running report aggregates from a JSON file."""
+    try:
+        with open(filename, "r") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        logging.info(f"{filename} not found. Starting fresh.")
+        return empty_aggregates()
+
+def save_aggregates(aggregates, filename="report_aggregates.json"):
+    """Save running report aggregates to a JSON file."""
+    with open(filename, "w") as file:
+        json.dump(aggregates, file)
+
+def update_aggregates(aggregates, articles, matcher, day=None, window_days=WINDOW_DAYS):
+    """Add newly saved articles to the per-source, per-keyword and per-day counts.
+
+    Each day keeps the IDs of the articles it counted, so a headline that
+    stays on a homepage is counted once per window rather than once per run.
+    """
+    day = (day or date.today()).isoformat()
+    totals = aggregates["totals"]
+
+    # Drop per-day detail outside the window so report cost stays flat as history grows
+    cutoff = (date.fromisoformat(day) - timedelta(days=window_days)).isoformat()
+    for old_day in [d for d in aggregates["days"] if d < cutoff]:
+        del aggregates["days"][old_day]
+
+    today = aggregates["days"].setdefault(day, {"sources": {}, "keywords": {}})
+    today_ids = today.setdefault("ids", [])
+    counted = {article_id for counts in aggregates["days"].values() for article_id in counts.get("ids", [])}
+    for article in articles:
+        if not article.link or article.id in counted:
+            continue  # Quota placeholders aren't real articles; others were counted on an earlier run
+        counted.add(article.id)
+        today_ids.append(article.id)
+        source = article.source
+        totals["articles"] += 1
+        totals["sources"][source] = totals["sources"].get(source, 0) + 1
+        today["sources"][source] = today["sources"].get(source, 0) + 1
+        for keyword in article.keywords(matcher):
+            totals["keywords"][keyword] = totals["keywords"].get(keyword, 0) + 1
+            today["keywords"][keyword] = today["keywords"].get(keyword, 0) + 1
+    return aggregates
+
+# --- Summaries ---
+def daily_frame(aggregates, field):
+    """Return a days x names DataFrame of counts for "sources" or "keywords"."""
+    frame = pd.DataFrame.from_dict(
+        {day: counts[field] for day, counts in aggregates["days"].items()}, orient="index"
+    )
+    if frame.empty:
+        return frame
+    frame.index = pd.to_datetime(frame.index)
+    return frame.sort_index().fillna(0).astype(np.int64)
+
+def summarize(aggregates, recent_days=7):
+    """Return a per-source summary table: all-time total, window total and recent daily average."""
+    totals = pd.Series(aggregates["totals"]["sources"], dtype=np.int64)
+    daily = daily_frame(aggregates, "sources")
+    if daily.empty:
+        return pd.DataFrame({"total": totals})
+    window_total = daily.sum(axis=0)
+    recent = daily.iloc[-recent_days:]
+    recent_average = recent.sum(axis=0) / len(recent)
+    summary = pd.DataFrame({
+        "total": totals,
+        "window_total": window_total,
+        f"avg_last_{recent_days}d": recent_average.round(2),
+    }).fillna(0)
+    summary["share"] = (summary["total"] / max(summary["total"].sum(), 1)).round(4)
+    return summary.sort_values("total", ascending=False)
+
+# --- Charts ---
+def plot_article_counts(article_counts, filename="article_counts.png"):
+    """Plot the number of articles fetched per source in this run."""
+    if not article_counts:
+        logging.warning("No article counts to plot.")
+        return None
+    sources = list(article_counts)
+    counts = np.array([article_counts[source] for source in sources])
+    plt.figure(figsize=(10, 6))
+    sns.barplot(x=counts, y=sources, color="steelblue")
+    plt.xlabel("Articles")
+    plt.title("Articles fetched per source")
+    plt.tight_layout()
+    plt.savefig(filename)
+    plt.close()
+    logging.info(f"Saved article count chart to {filename}")
+    return filename
+
+def generate_report(aggregates, prefix="report", top_keywords=15):
+    """Write a summary CSV and trend charts from the running aggregates."""
+    summary = summarize(aggregates)
+    summary_file = f"{prefix}_summary.csv"
+    summary.to_csv(summary_file, index_label="source")
+
+    daily_sources = daily_frame(aggregates, "sources")
+    if not daily_sources.empty:
+        fig, ax = plt.subplots(figsize=(12, 6))
+        daily_sources.plot(ax=ax, legend=len(daily_sources.columns) <= 15)
+        ax.set_ylabel("Articles")
+        ax.set_title("Articles per source per day")
+        fig.tight_layout()
+        fig.savefig(f"{prefix}_sources_daily.png")
+        plt.close(fig)
+
+    keyword_totals = pd.Series(aggregates["totals"]["keywords"], dtype=np.int64)
+    if not keyword_totals.empty:
+        keyword_totals = keyword_totals.nlargest(top_keywords)
+        fig, ax = plt.subplots(figsize=(10, 6))
+        sns.barplot(x=keyword_totals.to_numpy(), y=keyword_totals.index.to_numpy(), color="darkorange", ax=ax)
+        ax.set_xlabel("Articles")
+        ax.set_title("Top keywords (all time)")
+        fig.tight_layout()
+        fig.savefig(f"{prefix}_keywords.png")
+        plt.close(fig)
+
+    logging.info(f"Report written to {summary_file}")
+    return summary
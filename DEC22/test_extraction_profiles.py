@@ -0,0 +1,54 @@
+import time
+
+from extraction_profiles import ExtractionProfile, get_profile, learn_profile
+
+KEYWORDS = ["police", "black"]
+
+ROOT_SLUG_PAGE = [
+    ("Police reform bill passes", "/police-reform-bill-passes", "h2"),
+    ("City council votes on budget", "/city-council-votes-on-budget", "h2"),
+    ("New school opens downtown", "/new-school-opens-downtown", "h2"),
+    ("Featured", "/featured", "h2"),
+    ("Topics", "/topics", "h2"),
+    ("Sign in", "/sign-in", "h2"),
+    ("About", "/about", "h2"),
+    ("Black history", "/tag/black", "h2"),
+]
+
+def profile_for(links, host="example.com"):
+    entry = learn_profile(links, KEYWORDS, host)
+    return ExtractionProfile(entry["patterns"], entry["positions"], host)
+
+def test_root_level_slugs_do_not_admit_nav_links():
+    profile = profile_for(ROOT_SLUG_PAGE)
+    assert profile.accepts("/another-long-story-slug", "h2")
+    for href in ("/featured", "/topics", "/sign-in", "/about", "/tag/black"):
+        assert not profile.accepts(href, "h2"), href
+
+def test_dated_articles_next_to_junk():
+    links = [
+        ("Police story", "/2024/12/20/police-story-one", "article"),
+        ("Another story", "/2024/12/21/another-story-here", "article"),
+        ("Black voters", "/tag/black", "article"),
+        ("Black voters", "/tag/black/", "h3"),
+        ("Police", "/section/police", "header"),
+    ]
+    profile = profile_for(links)
+    assert profile.positions == {"article"}
+    assert profile.accepts("/2024/12/22/a-new-story", "article")
+    assert not profile.accepts("/tag/black", "article")
+    assert not profile.accepts("/2024/12/22/a-new-story", "header")
+
+def test_one_story_linked_twice_is_not_enough_support():
+    links = [("Police story", "/2024/12/20/police-story-one", "h2"),
+             ("Police story", "/2024/12/20/police-story-one/", "h3")]
+    assert learn_profile(links, KEYWORDS, "example.com") is None
+
+def test_links_to_other_hosts_are_rejected():
+    profile = profile_for(ROOT_SLUG_PAGE, host="www.example.com")
+    assert profile.accepts("https://example.com/another-long-story-slug", "h2")
+    assert not profile.accepts("https://ads.example.net/another-long-story-slug", "h2")
+
+def test_profiles_with_the_old_catch_all_slug_are_relearned():
+    profiles = {"example.com": {"patterns": ["/[^/]+"], "positions": ["h2"], "learned": time.time()}}
+    assert get_profile(profiles, "example.com") is None
@@ -0,0 +1,87 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from feed_stream import parse_feed_bytes
+from page_links import extract_page_links
+
+class ResponseArchive:
+    """Content-addressed archive of raw feed responses and rendered pages.
+
+    Bodies are gzip-compressed and stored once under their SHA-256 in
+    ``objects/``, so a page that didn't change between runs costs one index
+    line rather than another copy. ``records.jsonl`` lists every capture
+    with its run, source, kind, URL and body digest.
+    """
+
+    def __init__(self, root="archive"):
+        self.root = root
+        self.index_file = os.path.join(root, "records.jsonl")
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest + ".gz")
+
+    def store(self, run_id, source, kind, url, body, content_type=""):
+        """Archive one response body and record the capture. Returns the body digest."""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with gzip.open(temp_path, "wb", compresslevel=6) as file:
+                file.write(body)
+            os.replace(temp_path, path)
+        record = {"run": run_id, "source": source, "kind": kind, "url": url,
+                  "digest": digest, "content_type": content_type, "ts": round(time.time(), 3)}
+        with open(self.index_file, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record) + "\n")
+        return digest
+
+    def recorder(self, run_id, source):
+        """Return a callback that archives responses for one source."""
+        def record(kind, url, body, content_type=""):
+            self.store(run_id, source, kind, url, body, content_type)
+        return record
+
+    def load(self, digest):
+        """Return the raw body stored under a digest."""
+        with gzip.open(self._object_path(digest), "rb") as file:
+            return file.read()
+
+    def records(self, run_id=None):
+        """Return the captures for a run (by default the run with the newest capture)."""
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as file:
+                records = [json.loads(line) for line in file if line.strip()]
+        except FileNotFoundError:
+            return []
+        if run_id is None and records:
+            # Run ids come in several formats, so go by capture time rather than by id
+            run_id = max(records, key=lambda record: record["ts"])["run"]
+        return [record for record in records if record["run"] == run_id]
+
+# --- Replay ---
+def replay_record(root, record):
+    """Re-run extraction on one archived capture. Returns (source, kind, rows)."""
+    body = ResponseArchive(root).load(record["digest"])
+    if record["kind"] == "feed":
+        rows = [(entry["title"], entry["link"], entry["id"]) for entry in parse_feed_bytes(body)]
+    else:
+        html = body.decode("utf-8", errors="replace")
+        rows = [(title, link, "") for title, link in extract_page_links(html, record["url"])]
+    return record["source"], record["kind"], rows
+
+def replay_archive(root="archive", run_id=None, workers=None, replay=replay_record):
+    """Run ``replay(root, record)`` on every capture of a run in parallel, without touching the network.
+
+    ``replay`` must be a module-level function so it can be sent to the worker processes.
+    """
+    records = ResponseArchive(root).records(run_id)
+    logging.info(f"Replaying {len(records)} archived responses from {root}")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(replay, [root] * len(records), records))
@@ -0,0 +1,86 @@
+import hashlib
+import sys
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+TRACKING_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {"fbclid", "gclid", "cmpid", "ref"}  # Exact keys; "reference" or "refresh" may select content
+
+def canonical_url(link):
+    """Normalize a link so trivially different URLs for one article compare equal."""
+    link = link.strip()
+    if "?" not in link and "#" not in link:
+        # Fast path for the usual case: only the scheme, host and trailing slash need normalizing
+        scheme, sep, rest = link.partition("://")
+        host, slash, path = rest.partition("/")
+        path = path.rstrip("/")
+        return f"{scheme.lower()}{sep}{host.lower()}/{path}" if sep else link.rstrip("/")
+    parts = urlsplit(link)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not key.lower().startswith(TRACKING_PREFIXES) and key.lower() not in TRACKING_PARAMS]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+def article_id(link):
+    """Return a 64-bit ID for an article, derived from its canonical URL."""
+    digest = hashlib.blake2b(canonical_url(link).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+class KeywordMatcher:
+    """Match titles against the keyword list, returning matches as a bitset.
+
+    Bit ``i`` of the mask is set when ``keywords[i]`` occurs in the title,
+    using the same case-insensitive substring rule as before.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        self._lowered = [(1 << i, keyword.lower()) for i, keyword in enumerate(self.keywords)]
+
+    def match(self, title):
+        """Return the bitset of keywords found in a title."""
+        title = title.lower()
+        mask = 0
+        for bit, keyword in self._lowered:
+            if keyword in title:
+                mask |= bit
+        return mask
+
+    def names(self, mask):
+        """Return the keywords encoded in a bitset, in keyword-list order."""
+        return [keyword for i, keyword in enumerate(self.keywords) if mask >> i & 1]
+
+class Article:
+    """Compact article record shared by every scraper."""
+
+    __slots__ = ("id", "title", "link", "source", "guid", "keyword_mask", "published")
+
+    def __init__(self, title, link, source, guid="", published=None):
+        self.title = title
+        self.link = link
+        self.source = sys.intern(source)  # A handful of sources repeated across every record
+        self.guid = guid
+        self.id = article_id(link) if link else article_id(title)
+        self.keyword_mask = 0
+        self.published = published  # Epoch seconds, when the source gave a date
+
+    def keywords(self, matcher):
+        """Return the names of the keywords this article matched."""
+        return matcher.names(self.keyword_mask)
+
+    def to_dict(self, matcher):
+        """Return the article in the old dict form."""
+        return {"title": self.title, "link": self.link, "source": self.source,
+                "keywords": self.keywords(matcher)}
+
+    def __repr__(self):
+        return f"Article({self.title!r}, {self.link!r}, {self.source!r})"
+
+def unique_articles(articles):
+    """Drop articles whose ID has already appeared, keeping the first."""
+    seen = set()
+    unique = []
+    for article in articles:
+        if article.id not in seen:
+            seen.add(article.id)
+            unique.append(article)
+    return unique
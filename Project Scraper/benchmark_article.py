@@ -0,0 +1,104 @@
+"""Compare plain article dicts with the Article record at 1M records.
+
+Measures memory held by the records, construction time, dedup time
+and keyword-filter time for both representations.
+"""
+import gc
+import json
+import time
+import tracemalloc
+
+from article import Article, KeywordMatcher, unique_articles
+
+RECORD_COUNT = 1_000_000
+SOURCES = ["The Grio", "The Root", "Black Enterprise", "Atlanta Black Star", "NewsOne",
+           "Andscape", "Semafor", "Blavity", "Forbes", "Hugging Face"]
+
+with open("config.json", "r") as config_file:
+    KEYWORDS = json.load(config_file).get("KEYWORDS", [])
+
+def make_rows(count):
+    """Yield (title, link, source) rows with about 10% duplicate links."""
+    for i in range(count):
+        n = i - i % 10 if i % 10 == 9 else i  # Every tenth row repeats an earlier link
+        source = SOURCES[n % len(SOURCES)]
+        # Build a fresh source string per row, the way a scraper would
+        yield (f"Story {n}: Black culture and machine learning" if n % 3 == 0 else f"Story {n}: Local weather",
+               f"https://example{n % len(SOURCES)}.com/2024/12/20/story-{n}/",
+               "".join(list(source)))
+
+def build_dicts():
+    return [{"title": title, "link": link, "source": source} for title, link, source in make_rows(RECORD_COUNT)]
+
+def build_articles():
+    return [Article(title, link, source) for title, link, source in make_rows(RECORD_COUNT)]
+
+def measure(build):
+    """Return the records, the seconds to build them and the bytes they hold."""
+    gc.collect()
+    start = time.perf_counter()
+    records = build()
+    elapsed = time.perf_counter() - start
+    del records
+    gc.collect()
+    # Build again under tracemalloc, which slows allocation too much to time
+    tracemalloc.start()
+    records = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return records, elapsed, size
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def dedup_dicts(records):
+    seen = set()
+    unique = []
+    for record in records:
+        identifier = (record["title"], record["link"])
+        if identifier not in seen:
+            seen.add(identifier)
+            unique.append(record)
+    return unique
+
+def filter_dicts(records):
+    filtered = []
+    for record in records:
+        title = record["title"].lower()
+        matching = [keyword for keyword in KEYWORDS if keyword.lower() in title]
+        if matching:
+            record["keywords"] = matching
+            filtered.append(record)
+    return filtered
+
+def filter_articles(records, matcher):
+    filtered = []
+    for record in records:
+        record.keyword_mask = matcher.match(record.title)
+        if record.keyword_mask:
+            filtered.append(record)
+    return filtered
+
+def main():
+    matcher = KeywordMatcher(KEYWORDS)
+
+    dicts, dict_build, dict_bytes = measure(build_dicts)
+    unique_dicts, dict_dedup = timed(lambda: dedup_dicts(dicts))
+    filtered_dicts, dict_filter = timed(lambda: filter_dicts(unique_dicts))
+    del dicts, unique_dicts, filtered_dicts
+
+    articles, article_build, article_bytes = measure(build_articles)
+    unique, article_dedup = timed(lambda: unique_articles(articles))
+    filtered, article_filter = timed(lambda: filter_articles(unique, matcher))
+
+    print(f"{RECORD_COUNT:,} records ({len(unique):,} unique, {len(filtered):,} matching keywords)")
+    print(f"{'':12}{'dict':>12}{'Article':>12}")
+    print(f"{'memory MB':12}{dict_bytes / 2**20:12.1f}{article_bytes / 2**20:12.1f}")
+    print(f"{'build s':12}{dict_build:12.2f}{article_build:12.2f}")
+    print(f"{'dedup s':12}{dict_dedup:12.2f}{article_dedup:12.2f}")
+    print(f"{'filter s':12}{dict_filter:12.2f}{article_filter:12.2f}")
+
+if __name__ == "__main__":
+    main()
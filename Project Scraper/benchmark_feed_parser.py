@@ -0,0 +1,84 @@
+"""Compare feedparser with the streaming parser in feed_stream.py.
+
+Builds large RSS and Atom fixture feeds and times three cases:
+feedparser on the whole document, the streaming parser on the whole
+document, and the streaming parser stopping after the newest entries.
+"""
+import time
+from xml.sax.saxutils import escape
+
+import feedparser
+
+from feed_stream import parse_feed_stream
+
+ENTRY_COUNT = 5000
+NEW_ENTRIES = 10
+CHUNK_SIZE = 16384
+ROUNDS = 5
+
+def build_rss(count):
+    """Return an RSS 2.0 document with ``count`` items as bytes."""
+    items = []
+    for i in range(count):
+        items.append(
+            "<item>"
+            f"<title>{escape(f'Story {i}: Black culture & machine learning')}</title>"
+            f"<link>https://example.com/2024/12/20/story-{i}/</link>"
+            f"<guid>https://example.com/?p={i}</guid>"
+            "<pubDate>Fri, 20 Dec 2024 18:00:00 +0000</pubDate>"
+            f"<description>{escape('<p>' + 'Lorem ipsum dolor sit amet. ' * 20 + '</p>')}</description>"
+            "</item>"
+        )
+    return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            "<title>Fixture</title><link>https://example.com/</link>"
+            + "".join(items) + "</channel></rss>").encode("utf-8")
+
+def build_atom(count):
+    """Return an Atom document with ``count`` entries as bytes."""
+    entries = []
+    for i in range(count):
+        entries.append(
+            "<entry>"
+            f"<title>Story {i}: ChatGPT and DEI</title>"
+            f'<link rel="alternate" href="https://example.com/2024/12/20/story-{i}/"/>'
+            f"<id>tag:example.com,2024:{i}</id>"
+            "<updated>2024-12-20T18:00:00Z</updated>"
+            f"<summary>{'Lorem ipsum dolor sit amet. ' * 20}</summary>"
+            "</entry>"
+        )
+    return ('<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+            "<title>Fixture</title>" + "".join(entries) + "</feed>").encode("utf-8")
+
+def chunked(data):
+    """Split a byte string into download-sized chunks."""
+    return [data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE)]
+
+def best_of(func):
+    """Return the best wall-clock time over ROUNDS runs and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    for name, data in (("RSS", build_rss(ENTRY_COUNT)), ("Atom", build_atom(ENTRY_COUNT))):
+        chunks = chunked(data)
+        # Everything below the newest NEW_ENTRIES was seen on a previous run
+        all_entries = list(parse_feed_stream(chunks))
+        seen = {entry["id"] for entry in all_entries[NEW_ENTRIES:]}
+
+        fp_time, fp_result = best_of(lambda: feedparser.parse(data).entries)
+        full_time, full_result = best_of(lambda: list(parse_feed_stream(chunks)))
+        early_time, early_result = best_of(lambda: list(parse_feed_stream(chunks, seen)))
+
+        print(f"{name} feed: {ENTRY_COUNT} entries, {len(data) / 1024 / 1024:.1f} MB")
+        print(f"  feedparser (full)         {fp_time * 1000:8.1f} ms  {len(fp_result)} entries")
+        print(f"  streaming (full)          {full_time * 1000:8.1f} ms  {len(full_result)} entries")
+        print(f"  streaming (early stop)    {early_time * 1000:8.1f} ms  {len(early_result)} entries")
+        print(f"  speedup vs feedparser     {fp_time / early_time:8.1f}x")
+
+if __name__ == "__main__":
+    main()
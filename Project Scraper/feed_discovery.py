@@ -0,0 +1,88 @@
+import json
+import logging
+import time
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import requests
+from requests.exceptions import RequestException
+
+FEED_TYPES = ("application/rss+xml", "application/atom+xml", "application/feed+json")
+HEAD_BYTES_LIMIT = 256 * 1024  # Feed links live in <head>; never read past this
+
+headers = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36"
+}
+
+class FeedLinkParser(HTMLParser):
+    """Collect <link rel="alternate"> feed URLs from a page head."""
+
+    def __init__(self, base_url):
+        super().__init__()
+        self.base_url = base_url
+        self.feeds = []
+        self.head_done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            self.head_done = True
+            return
+        if tag != "link":
+            return
+        attrs = dict(attrs)
+        rel = (attrs.get("rel") or "").lower().split()
+        link_type = (attrs.get("type") or "").lower().strip()
+        href = attrs.get("href")
+        if "alternate" in rel and link_type in FEED_TYPES and href:
+            feed_url = urljoin(self.base_url, href.strip())
+            if feed_url not in self.feeds:
+                self.feeds.append(feed_url)
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.head_done = True
+
+# --- Persistent Feed Cache ---
+def load_feed_cache(filename="feed_cache.json"):
+    """Load previously discovered feeds from a JSON file."""
+    try:
+        with open(filename, "r") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        logging.info(f"{filename} not found. Starting fresh.")
+        return {}
+
+def save_feed_cache(cache, filename="feed_cache.json"):
+    """Save discovered feeds to a JSON file."""
+    with open(filename, "w") as file:
+        json.dump(cache, file, indent=4)
+
+def discover_feeds(url, timeout=10):
+    """Read a page head and return any advertised RSS/Atom feed URLs."""
+    parser = FeedLinkParser(url)
+    received = 0
+    with requests.get(url, headers=headers, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        encoding = response.encoding or "utf-8"
+        for chunk in response.iter_content(chunk_size=8192):
+            parser.feed(chunk.decode(encoding, errors="replace"))
+            received += len(chunk)
+            if parser.head_done or received >= HEAD_BYTES_LIMIT:
+                break
+    return parser.feeds
+
+def get_feeds_for_site(url, cache, recheck_hours=168):
+    """Return cached feed URLs for a site, re-running discovery when the entry is stale."""
+    entry = cache.get(url)
+    if entry and time.time() - entry.get("checked", 0) < recheck_hours * 3600:
+        return entry.get("feeds", [])
+    try:
+        feeds = discover_feeds(url)
+    except RequestException as e:
+        logging.warning(f"Feed autodiscovery failed for {url}: {e}")
+        # Keep the previous answer rather than forgetting a known feed
+        return entry.get("feeds", []) if entry else []
+    cache[url] = {"feeds": feeds, "checked": time.time()}
+    if feeds:
+        logging.info(f"Discovered {len(feeds)} feed(s) for {url}: {feeds[0]}")
+    return feeds
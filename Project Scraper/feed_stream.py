@@ -0,0 +1,149 @@
+import logging
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import feedparser
+import requests
+
+ENTRY_TAGS = ("item", "entry")
+# Entry fields are only read from plain RSS, RSS 1.0 or Atom elements, so
+# extension elements such as <media:title> can't overwrite them
+FEED_NAMESPACES = ("", "http://www.w3.org/2005/Atom", "http://purl.org/rss/1.0/")
+DC_NAMESPACE = "http://purl.org/dc/elements/1.1/"  # dc:date is the only date most RSS 1.0 feeds carry
+
+headers = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36"
+}
+
+def local_name(tag):
+    """Strip the XML namespace from a tag name."""
+    return tag.rsplit("}", 1)[-1]
+
+def tag_namespace(tag):
+    """Return the XML namespace of a tag name, or "" if it has none."""
+    return tag[1:].split("}", 1)[0] if tag.startswith("{") else ""
+
+def parse_published(text):
+    """Return a feed or API date (RFC 822 or ISO 8601) as epoch seconds, or None."""
+    text = (text or "").strip()
+    if not text:
+        return None
+    try:
+        moment = parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        try:
+            moment = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+def entry_from_element(element):
+    """Build an entry dict from an RSS <item> or Atom <entry> element."""
+    entry = {"title": "", "link": "", "id": "", "published": ""}
+    for child in element:
+        namespace = tag_namespace(child.tag)
+        name = local_name(child.tag)
+        text = (child.text or "").strip()
+        if namespace == DC_NAMESPACE and name == "date" and not entry["published"]:
+            entry["published"] = text
+        if namespace not in FEED_NAMESPACES:
+            continue
+        if name == "title":
+            entry["title"] = text
+        elif name == "link":
+            # RSS puts the URL in the text, Atom in href (prefer rel="alternate")
+            href = child.get("href")
+            if href and child.get("rel", "alternate") == "alternate":
+                entry["link"] = href.strip()
+            elif text and not entry["link"]:
+                entry["link"] = text
+        elif name in ("guid", "id"):
+            entry["id"] = text
+        elif name in ("pubDate", "published", "updated") and not entry["published"]:
+            entry["published"] = text
+    return entry
+
+def parse_feed_stream(chunks, seen=None):
+    """Yield feed entries from an iterable of byte chunks, newest first.
+
+    Stops at the first entry whose GUID or link is already in ``seen``.
+    Raises ``xml.etree.ElementTree.ParseError`` for malformed XML.
+    """
+    seen = seen or set()
+    parser = ET.XMLPullParser(events=("start", "end"))
+    depth = 0  # Nesting depth inside the current entry
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            is_entry = local_name(element.tag) in ENTRY_TAGS
+            if event == "start":
+                if is_entry or depth:
+                    depth += 1
+                continue
+            if not depth:
+                continue
+            depth -= 1
+            if depth == 0 and is_entry:
+                entry = entry_from_element(element)
+                element.clear()  # Keep memory flat on large feeds
+                if entry["id"] in seen or entry["link"] in seen:
+                    return
+                yield entry
+    parser.close()
+
+def feedparser_entries(feed, seen=None, skip_links=()):
+    """Yield entries from a feedparser result, stopping at the first seen one."""
+    seen = seen or set()
+    for item in feed.entries:
+        link = item.get("link", "").strip()
+        guid = item.get("id", "").strip()
+        if guid in seen or link in seen:
+            return
+        if link in skip_links:
+            continue
+        yield {
+            "title": item.get("title", "").strip(),
+            "link": link,
+            "id": guid,
+            "published": item.get("published") or item.get("updated", "")  # feedparser files dc:date as updated
+        }
+
+def parse_feed_bytes(body, seen=None):
+    """Parse a complete feed document, falling back to feedparser for malformed XML."""
+    try:
+        return list(parse_feed_stream([body], seen))
+    except ET.ParseError:
+        feed = feedparser.parse(body)
+        if feed.bozo and not feed.entries:
+            raise ValueError(f"Malformed feed: {feed.bozo_exception}")
+        return list(feedparser_entries(feed, seen))
+
+def stream_feed_entries(url, seen=None, timeout=10, record=None):
+    """Download a feed incrementally and yield only entries not yet seen.
+
+    When ``record`` is given the whole body is downloaded and passed to it
+    as ``record("feed", url, body, content_type)`` before parsing.
+    """
+    if record is not None:
+        response = requests.get(url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        record("feed", url, response.content, response.headers.get("Content-Type", ""))
+        yield from parse_feed_bytes(response.content, seen)
+        return
+
+    yielded = set()
+    try:
+        with requests.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            for entry in parse_feed_stream(response.iter_content(chunk_size=16384), seen):
+                yielded.add(entry["link"])
+                yield entry
+    except ET.ParseError as e:
+        logging.info(f"Streaming parse failed for {url} ({e}). Falling back to feedparser.")
+        feed = feedparser.parse(url)
+        if feed.bozo and not feed.entries:
+            raise ValueError(f"Malformed feed: {feed.bozo_exception}")
+        yield from feedparser_entries(feed, seen, yielded)
@@ -0,0 +1,39 @@
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+class PageLinkParser(HTMLParser):
+    """Collect (text, absolute href) for every <a> in a rendered page."""
+
+    def __init__(self, base_url):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.links = []
+        self._anchor = None
+        self._skip = 0  # Inside <script>/<style>, whose text isn't visible
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip += 1
+        elif tag == "a":
+            self._anchor = (dict(attrs).get("href"), [])
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style") and self._skip:
+            self._skip -= 1
+        elif tag == "a" and self._anchor is not None:
+            href, text = self._anchor
+            self._anchor = None
+            title = " ".join("".join(text).split())
+            if href and not href.startswith(("javascript:", "#")):
+                self.links.append((title, urljoin(self.base_url, href.strip())))
+
+    def handle_data(self, data):
+        if self._anchor is not None and not self._skip:
+            self._anchor[1].append(data)
+
+def extract_page_links(html, base_url):
+    """Return (title, link) pairs for the anchors in an HTML document."""
+    parser = PageLinkParser(base_url)
+    parser.feed(html)
+    parser.close()
+    return parser.links
@@ -1,17 +1,26 @@
+import argparse
 import requests
-import feedparser
 import csv
+import glob
 import logging
 import os
 import time
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 import json
 from requests.exceptions import RequestException
+from feed_discovery import load_feed_cache, save_feed_cache, get_feeds_for_site
+from feed_stream import stream_feed_entries, parse_published
+from shard_coordinator import ShardWorker
+from article import Article, KeywordMatcher, unique_articles
+from archive import ResponseArchive, replay_archive
+from page_links import extract_page_links
+from trend_monitor import load_trend_monitor, save_trend_monitor
+from social_source import (SocialTimelineSource, load_twitter_bearer_token, load_watermarks, save_watermarks,
+                           watermark_progress)
 
 # --- Load Configuration ---
 with open("config.json", "r") as config_file:
@@ -32,22 +41,46 @@ logging.getLogger().addHandler(console_handler)
 
 # --- Global Variables ---
 KEYWORDS = CONFIG.get("KEYWORDS", [])
+KEYWORD_MATCHER = KeywordMatcher(KEYWORDS)
 RSS_FEEDS = CONFIG.get("RSS_FEEDS", {})
 WEBSITES = CONFIG.get("WEBSITES", {})
+FEED_RECHECK_HOURS = CONFIG.get("FEED_RECHECK_HOURS", 168)
+SOCIAL_ACCOUNTS = CONFIG.get("SOCIAL_ACCOUNTS", {})
+ARCHIVE_DIR = CONFIG.get("ARCHIVE_DIR", "archive")
+TREND_SETTINGS = CONFIG.get("TREND_SETTINGS", {})
+ARTICLE_QUOTA = 200
 
 # --- Helper Functions ---
-def fetch_rss_feed(url, retries=3, backoff_factor=2):
-    """Fetch articles from an RSS feed with retries."""
+def fetch_rss_feed(url, seen=None, record=None, retries=3, backoff_factor=2):
+    """Fetch new articles from an RSS feed with retries.
+
+    Entries are streamed and parsing stops at the first one already in ``seen``.
+    Returns None if the feed could not be fetched at all.
+    """
     for attempt in range(retries):
         try:
-            feed = feedparser.parse(url)
-            if not feed.bozo:
-                return feed.entries
+            return list(stream_feed_entries(url, seen, record=record))
         except Exception as e:
             logging.warning(f"Attempt {attempt + 1} failed for {url}: {e}")
             time.sleep(backoff_factor ** attempt)  # Exponential backoff
     logging.error(f"Failed to fetch RSS feed after {retries} attempts: {url}")
-    return []
+    return None
+
+# --- Persistent Storage for Seen Articles ---
+def load_seen_links(filename="seen_links.json"):
+    """Load previously seen article links and GUIDs from a JSON file."""
+    try:
+        with open(filename, "r") as file:
+            return set(json.load(file))  # Load as a set for fast lookups
+    except FileNotFoundError:
+        logging.info(f"{filename} not found. Starting fresh.")
+        return set()
+
+def save_seen_links(seen_links, filename="seen_links.json"):
+    """Save seen article links and GUIDs to a JSON file."""
+    seen_links.discard("")
+    with open(filename, "w") as file:
+        json.dump(sorted(seen_links), file)
 
 def initialize_webdriver():
     """Initialize Selenium WebDriver for dynamic content scraping."""
@@ -59,94 +92,294 @@ def initialize_webdriver():
     chrome_service = ChromeService(executable_path=ChromeDriverManager().install())
     return webdriver.Chrome(service=chrome_service, options=chrome_options)
 
-def fetch_dynamic_content(url, source_name, retries=3):
+def articles_from_links(links, source_name):
+    """Turn (title, link) pairs from a rendered page into keyword-matching Articles."""
+    results = []
+    for title, link in links:
+        if title and link:
+            keyword_mask = KEYWORD_MATCHER.match(title)
+            if keyword_mask:
+                article = Article(title, link, source_name)
+                article.keyword_mask = keyword_mask
+                results.append(article)
+    return results
+
+def fetch_dynamic_content(url, source_name, record=None, retries=3):
     """Fetch articles from dynamically loaded websites using Selenium."""
     for attempt in range(retries):
+        driver = None
         try:
             driver = initialize_webdriver()
             driver.get(url)
             time.sleep(5)  # Allow time for dynamic content to load
-            articles = driver.find_elements(By.TAG_NAME, "a")
-            results = []
-            for article in articles:
-                title = article.text.strip()
-                link = article.get_attribute("href")
-                if title and link and any(keyword.lower() in title.lower() for keyword in KEYWORDS):
-                    results.append({"title": title, "link": link, "source": source_name})
-            driver.quit()
-            return results
+            # One page_source call instead of a WebDriver round trip per anchor;
+            # the same extraction runs when replaying an archived DOM
+            html = driver.page_source
+            if record:
+                record("dom", url, html.encode("utf-8"), "text/html; charset=utf-8")
+            return articles_from_links(extract_page_links(html, url), source_name)
         except Exception as e:
             logging.error(f"Selenium scraping error for {url}: {e}")
             time.sleep(2 ** attempt)  # Exponential backoff
+        finally:
+            if driver:
+                driver.quit()
     logging.error(f"Failed to scrape dynamic content after {retries} attempts: {url}")
     return []
 
 def save_to_csv(articles, filename):
-    """Save articles to a CSV file."""
-    with open(filename, mode="w", newline="", encoding="utf-8") as file:
+    """Save articles to a CSV file (written to a temp file, then renamed into place)."""
+    temp_file = filename + ".tmp"
+    with open(temp_file, mode="w", newline="", encoding="utf-8") as file:
         writer = csv.writer(file)
         writer.writerow(["Source", "Title", "Link", "Keywords Used"])
         for article in articles:
-            source = article.get("source", "").strip()
-            title = article.get("title", "").strip()
-            link = f'=HYPERLINK("{article.get("link", "")}", "Link")'
-            keywords = ", ".join(article.get("keywords", []))
-            writer.writerow([source, title, link, keywords])
-
-def filter_articles_by_keywords(articles, keywords):
-    """Filter articles based on keywords."""
+            link = f'=HYPERLINK("{article.link}", "Link")'
+            keywords = ", ".join(article.keywords(KEYWORD_MATCHER))
+            writer.writerow([article.source, article.title, link, keywords])
+    os.replace(temp_file, filename)
+
+def filter_articles_by_keywords(articles, matcher):
+    """Filter articles based on keywords, recording matches as a bitset."""
     filtered_articles = []
     for article in articles:
-        title = article.get("title", "").lower()
-        matching_keywords = [keyword for keyword in keywords if keyword.lower() in title]
-        if matching_keywords:
-            article["keywords"] = matching_keywords
+        article.keyword_mask = matcher.match(article.title)
+        if article.keyword_mask:
             filtered_articles.append(article)
     return filtered_articles
 
-# --- Main Script ---
-def main():
-    logging.info("News Sentinel started.")
-    all_articles = []
-    filtered_articles = []
+def scrape_source(source_name, url, kind, seen_links, feed_cache, stats, social=None, record=None):
+    """Fetch articles for one configured source."""
+    articles = []
+    if kind == "social":
+        logging.info(f"Fetching new posts from social account: {source_name}")
+        try:
+            entries = social.fetch_entries(url)
+        except Exception as e:
+            logging.error(f"Failed to fetch timeline for {source_name}: {e}")
+            return articles
+        for entry in entries:
+            articles.append(Article(entry["title"], entry["link"], source_name, entry["id"],
+                                    parse_published(entry["published"])))
+        return articles
 
-    # --- Fetch articles from RSS feeds ---
-    for source_name, url in RSS_FEEDS.items():
+    if kind == "rss":
         logging.info(f"Fetching articles from RSS feed: {source_name}")
-        articles = fetch_rss_feed(url)
-        if articles:
-            for entry in articles:
-                all_articles.append({
-                    "title": entry.get("title", "").strip(),
-                    "link": entry.get("link", "").strip(),
-                    "source": source_name
-                })
-        else:
+        entries = fetch_rss_feed(url, seen_links, record)
+        if entries is None:
             logging.warning(f"No articles fetched from RSS feed: {source_name}")
+        elif not entries:
+            logging.info(f"No new articles in RSS feed: {source_name}")
+        for entry in entries or []:
+            articles.append(Article(entry.get("title", "").strip(), entry.get("link", "").strip(),
+                                    source_name, entry.get("id", ""), parse_published(entry.get("published"))))
+        return articles
+
+    # Prefer an advertised RSS/Atom feed over a headless browser session
+    feeds = get_feeds_for_site(url, feed_cache, FEED_RECHECK_HOURS)
+    if feeds:
+        logging.info(f"Fetching articles from discovered feed: {source_name}")
+        entries = fetch_rss_feed(feeds[0], seen_links, record)
+        if entries is not None:
+            for entry in entries:
+                articles.append(Article(entry.get("title", "").strip(), entry.get("link", "").strip(),
+                                        source_name, entry.get("id", ""), parse_published(entry.get("published"))))
+            stats["browser_sessions_saved"] += 1
+            return articles
+        logging.warning(f"Discovered feed returned nothing for {source_name}. Falling back to Selenium.")
+
+    logging.info(f"Scraping articles from dynamic site: {source_name}")
+    stats["browser_sessions_used"] += 1
+    return fetch_dynamic_content(url, source_name, record)
+
+def replay_articles(run_id=None):
+    """Rebuild a run's articles from the response archive, without any network access."""
+    articles = []
+    for source_name, kind, rows in replay_archive(ARCHIVE_DIR, run_id):
+        if kind == "feed":
+            articles.extend(Article(title, link, source_name, guid) for title, link, guid in rows)
+        else:
+            articles.extend(articles_from_links([(title, link) for title, link, _ in rows], source_name))
+    return articles
+
+def load_shared_seen_links(shared_dir):
+    """Load the union of every worker's seen links from a shared directory."""
+    seen_links = set()
+    for filename in glob.glob(os.path.join(shared_dir, "seen_links*.json")):
+        seen_links |= load_seen_links(filename)
+    return seen_links
 
-    # --- Fetch articles from dynamic websites ---
-    for source_name, url in WEBSITES.items():
-        if source_name not in RSS_FEEDS:  # Avoid duplicating RSS sources
-            logging.info(f"Scraping articles from dynamic site: {source_name}")
-            articles = fetch_dynamic_content(url, source_name)
-            all_articles.extend(articles)
+def load_shared_watermarks(shared_dir):
+    """Load every worker's social watermarks, keeping the furthest-along state per account."""
+    watermarks = {}
+    for filename in glob.glob(os.path.join(shared_dir, "social_watermarks*.json")):
+        for handle, state in load_watermarks(filename).items():
+            current = watermarks.get(handle)
+            if current is None or watermark_progress(state) > watermark_progress(current):
+                state["user_id"] = state.get("user_id") or (current or {}).get("user_id")
+                watermarks[handle] = state
+            else:
+                current["user_id"] = current.get("user_id") or state.get("user_id")
+    return watermarks
 
-    # --- Filter articles by keywords ---
-    filtered_articles = filter_articles_by_keywords(all_articles, KEYWORDS)
+def update_trends(events, trend_file):
+    """Feed one round's (keywords, source, published) events to the trend monitor and log bursts."""
+    trends = load_trend_monitor(trend_file, **TREND_SETTINGS)
+    bursts = trends.observe_run(events)
+    save_trend_monitor(trends, trend_file)
+    for burst in bursts:
+        where = f" at {burst['source']}" if burst["source"] else " across outlets"
+        logging.info(f"Keyword burst: '{burst['keyword']}'{where} "
+                     f"({burst['count']} recent articles, {burst['ratio']}x baseline)")
+    if not bursts:
+        logging.info("No keyword bursts detected.")
+
+def new_trend_events(articles, seen_links):
+    """Return (keywords, source, published) events for matching articles not seen on an earlier run."""
+    return [(article.keywords(KEYWORD_MATCHER), article.source, article.published)
+            for article in articles
+            if article.keyword_mask and article.link not in seen_links and article.guid not in seen_links]
+
+def load_trend_events(round_dir):
+    """Load the trend events every worker wrote for a round."""
+    events = []
+    for filename in glob.glob(os.path.join(round_dir, "trend_events_*.json")):
+        with open(filename, "r") as file:
+            events.extend(json.load(file))
+    return events
+
+def save_source_output(worker, source_name, articles, seen_links):
+    """Write one source's articles and trend events for a sharded round. Returns the deduped articles.
+
+    Runs before the worker asks for its next source, which is when this
+    one is marked done, so a worker that dies never loses finished sources.
+    """
+    articles = filter_and_save(articles, worker.source_file("news", source_name, ".csv"),
+                               worker.source_file("extra", source_name, ".csv"))
+    events_file = worker.source_file("trend_events", source_name, ".json")
+    with open(events_file + ".tmp", "w") as file:
+        json.dump(new_trend_events(articles, seen_links), file)
+    os.replace(events_file + ".tmp", events_file)
+    return articles
+
+def filter_and_save(all_articles, output_file, extra_file=None):
+    """Dedup, keyword-filter and top up articles, then save them. Returns the deduped articles.
+
+    With ``extra_file`` (sharded mode) the output is not padded; the
+    unfiltered candidates go to ``extra_file`` so the quota can be applied
+    once, when the workers' outputs are merged.
+    """
+    # --- Drop duplicates and filter articles by keywords ---
+    all_articles = unique_articles(all_articles)
+    filtered_articles = filter_articles_by_keywords(all_articles, KEYWORD_MATCHER)
     logging.info(f"Filtered {len(filtered_articles)} articles matching keywords.")
 
+    filtered_ids = {article.id for article in filtered_articles}
+    additional_articles = [article for article in all_articles if article.id not in filtered_ids]
+    if extra_file:
+        save_to_csv(additional_articles[:ARTICLE_QUOTA], extra_file)
     # --- Ensure minimum 200 articles ---
-    if len(filtered_articles) < 200:
-        logging.warning("Fewer than 200 articles found. Adding unfiltered articles to meet the quota.")
-        additional_articles = [article for article in all_articles if article not in filtered_articles]
-        filtered_articles += additional_articles[:200 - len(filtered_articles)]
-    logging.info(f"Total articles after fallback: {len(filtered_articles)}")
+    elif len(filtered_articles) < ARTICLE_QUOTA:
+        logging.warning(f"Fewer than {ARTICLE_QUOTA} articles found. Adding unfiltered articles to meet the quota.")
+        filtered_articles += additional_articles[:ARTICLE_QUOTA - len(filtered_articles)]
+        logging.info(f"Total articles after fallback: {len(filtered_articles)}")
 
     # --- Save to CSV ---
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = f"news_{timestamp}.csv"
     save_to_csv(filtered_articles, output_file)
     logging.info(f"Saved {len(filtered_articles)} articles to {output_file}")
+    return all_articles
+
+# --- Main Script ---
+def main(worker_id=None, shared_dir=None, round_id=None, record=False, replay=None):
+    logging.info("News Sentinel started.")
+    all_articles = []
+
+    # --- Replay mode: re-run extraction and filtering on archived responses only ---
+    if replay:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        all_articles = replay_articles(None if replay == "latest" else replay)
+        filter_and_save(all_articles, f"news_replay_{timestamp}.csv")
+        return
+
+    # RSS feeds first, then websites that don't already have a configured feed
+    sources = {name: (url, "rss") for name, url in RSS_FEEDS.items()}
+    for name, url in WEBSITES.items():
+        sources.setdefault(name, (url, "website"))
+
+    # Social timelines only when credentials are available
+    bearer_token = load_twitter_bearer_token(CONFIG)
+    if SOCIAL_ACCOUNTS and not bearer_token:
+        logging.warning("SOCIAL_ACCOUNTS configured but no TWITTER_BEARER_TOKEN found. Skipping social sources.")
+    elif bearer_token:
+        for name, handle in SOCIAL_ACCOUNTS.items():
+            sources.setdefault(name, (handle, "social"))
+
+    # --- Sharded mode: each worker keeps its own state files in the shared directory ---
+    worker = None
+    if worker_id:
+        round_id = round_id or datetime.now().strftime("%Y%m%d")
+        worker = ShardWorker(worker_id, shared_dir, round_id)
+        if worker.round_complete(list(sources)):
+            logging.error(f"Round {round_id} is already complete. Pass a new --round to scrape again.")
+            return
+        worker.start()
+        seen_file = os.path.join(shared_dir, f"seen_links_{worker_id}.json")
+        feed_cache_file = os.path.join(shared_dir, f"feed_cache_{worker_id}.json")
+        watermark_file = os.path.join(shared_dir, f"social_watermarks_{worker_id}.json")
+        seen_links = load_shared_seen_links(shared_dir)
+        watermarks = load_shared_watermarks(shared_dir)
+        source_names = worker.claim_sources(list(sources))
+    else:
+        seen_file = "seen_links.json"
+        feed_cache_file = "feed_cache.json"
+        watermark_file = "social_watermarks.json"
+        seen_links = load_seen_links(seen_file)
+        watermarks = load_watermarks(watermark_file)
+        source_names = list(sources)
+
+    # --- Fetch articles from RSS feeds, dynamic websites and social timelines ---
+    feed_cache = load_feed_cache(feed_cache_file)
+    social = SocialTimelineSource(bearer_token, watermarks) if bearer_token else None
+    archive = ResponseArchive(ARCHIVE_DIR) if record else None
+    run_id = round_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+    stats = {"browser_sessions_saved": 0, "browser_sessions_used": 0}
+    for source_name in source_names:
+        url, kind = sources[source_name]
+        recorder = archive.recorder(run_id, source_name) if archive else None
+        articles = scrape_source(source_name, url, kind, seen_links, feed_cache, stats, social, recorder)
+        if worker:
+            articles = save_source_output(worker, source_name, articles, seen_links)
+        all_articles.extend(articles)
+    save_feed_cache(feed_cache, feed_cache_file)
+    save_watermarks(watermarks, watermark_file)
+    logging.info(f"Feed autodiscovery saved {stats['browser_sessions_saved']} browser sessions "
+                 f"({stats['browser_sessions_used']} Selenium sessions still needed).")
+
+    # --- Filter, dedup and save to CSV (workers already saved each source as they went) ---
+    if not worker:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        all_articles = filter_and_save(all_articles, f"news_{timestamp}.csv")
+        # --- Keyword trends: count only articles not seen on an earlier run ---
+        update_trends(new_trend_events(all_articles, seen_links), "trend_state.json")
+
+    # --- Remember what we've seen so the next run stops at it ---
+    for article in all_articles:
+        seen_links.add(article.link)
+        seen_links.add(article.guid)
+    save_seen_links(seen_links, seen_file)
+
+    # --- The last worker to finish merges everyone's output ---
+    # One shared trend state, updated by whoever merges the round, so cross-outlet bursts add up
+    if worker and worker.finish(os.path.join(shared_dir, f"news_{round_id}_merged.csv"), ARTICLE_QUOTA):
+        update_trends(load_trend_events(worker.round_dir), os.path.join(shared_dir, "trend_state.json"))
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="News Sentinel scraper.")
+    parser.add_argument("--worker-id", help="Run as one sharded worker with this id")
+    parser.add_argument("--shared-dir", default=".", help="Directory shared by all workers")
+    parser.add_argument("--round", help="Identifier shared by all workers of one run")
+    parser.add_argument("--record", action="store_true", help="Archive raw feed responses and rendered pages")
+    parser.add_argument("--replay", nargs="?", const="latest", metavar="RUN",
+                        help="Re-run extraction offline from the archive (latest run by default)")
+    args = parser.parse_args()
+    main(args.worker_id, args.shared_dir, args.round, args.record, args.replay)
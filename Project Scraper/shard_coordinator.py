@@ -0,0 +1,277 @@
+import argparse
+import bisect
+import csv
+import glob
+import hashlib
+import logging
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+MERGE_LEASE = "__merge__"
+
+# --- Consistent Hashing ---
+def hash_key(key):
+    """Map a string onto the 64-bit hash ring."""
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+class HashRing:
+    """Consistent hash ring with virtual nodes, so adding a worker moves ~1/N of the sources."""
+
+    def __init__(self, workers, replicas=100):
+        self.points = []
+        self.owners = {}
+        for worker in workers:
+            for i in range(replicas):
+                point = hash_key(f"{worker}#{i}")
+                self.owners[point] = worker
+                self.points.append(point)
+        self.points.sort()
+
+    def owner(self, key):
+        """Return the worker responsible for a key, or None if the ring is empty."""
+        if not self.points:
+            return None
+        index = bisect.bisect(self.points, hash_key(key)) % len(self.points)
+        return self.owners[self.points[index]]
+
+# --- Lease Table ---
+class LeaseTable:
+    """Worker heartbeats and per-source leases in a SQLite file on a shared directory."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS workers (
+                worker_id TEXT PRIMARY KEY, round TEXT, heartbeat REAL, finished INTEGER DEFAULT 0)""")
+            conn.execute("""CREATE TABLE IF NOT EXISTS leases (
+                round TEXT, source TEXT, worker_id TEXT, expires REAL, done INTEGER DEFAULT 0,
+                PRIMARY KEY (round, source))""")
+
+    def _connect(self):
+        # One short-lived connection per call keeps this safe to use from the heartbeat thread
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def heartbeat(self, worker_id, round_id, ttl):
+        """Record that a worker is alive and extend the leases it holds."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("""INSERT INTO workers (worker_id, round, heartbeat, finished) VALUES (?, ?, ?, 0)
+                ON CONFLICT(worker_id) DO UPDATE SET round = excluded.round, heartbeat = excluded.heartbeat,
+                finished = CASE WHEN workers.round = excluded.round THEN workers.finished ELSE 0 END""",
+                (worker_id, round_id, now))
+            conn.execute("UPDATE leases SET expires = ? WHERE round = ? AND worker_id = ? AND done = 0",
+                         (now + ttl, round_id, worker_id))
+
+    def live_workers(self, round_id, ttl):
+        """Return the sorted ids of workers in this round with a recent heartbeat."""
+        with self._connect() as conn:
+            rows = conn.execute("""SELECT worker_id FROM workers
+                WHERE round = ? AND heartbeat >= ? AND finished = 0""",
+                (round_id, time.time() - ttl)).fetchall()
+        return sorted(row[0] for row in rows)
+
+    def mark_finished(self, worker_id, round_id):
+        """Record that a worker has written its output for this round."""
+        with self._connect() as conn:
+            conn.execute("UPDATE workers SET finished = 1 WHERE worker_id = ? AND round = ?",
+                         (worker_id, round_id))
+
+    def acquire(self, round_id, source, worker_id, ttl):
+        """Take the lease on a source unless another live worker holds it or it is done."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.isolation_level = None
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT worker_id, expires, done FROM leases WHERE round = ? AND source = ?",
+                               (round_id, source)).fetchone()
+            if row is None:
+                conn.execute("INSERT INTO leases (round, source, worker_id, expires) VALUES (?, ?, ?, ?)",
+                             (round_id, source, worker_id, now + ttl))
+                acquired = True
+            elif not row[2] and (row[0] == worker_id or row[1] < now):
+                if row[0] != worker_id:
+                    logging.info(f"Taking over {source} from {row[0]} (lease expired).")
+                conn.execute("UPDATE leases SET worker_id = ?, expires = ? WHERE round = ? AND source = ?",
+                             (worker_id, now + ttl, round_id, source))
+                acquired = True
+            else:
+                acquired = False
+            conn.execute("COMMIT")
+            return acquired
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def mark_done(self, round_id, source, worker_id):
+        """Mark a leased source as finished for this round."""
+        with self._connect() as conn:
+            conn.execute("UPDATE leases SET done = 1 WHERE round = ? AND source = ? AND worker_id = ?",
+                         (round_id, source, worker_id))
+
+    def done_sources(self, round_id):
+        """Return the set of sources finished in this round."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT source FROM leases WHERE round = ? AND done = 1",
+                                (round_id,)).fetchall()
+        return {row[0] for row in rows}
+
+# --- Worker ---
+class ShardWorker:
+    """Claims this worker's share of the sources and keeps its heartbeat going.
+
+    Each round keeps its per-source output files in its own subdirectory of
+    ``shared_dir``, so rounds whose ids share a prefix never mix.
+    """
+
+    def __init__(self, worker_id, shared_dir, round_id, ttl=60):
+        self.worker_id = worker_id
+        self.shared_dir = shared_dir
+        self.round_id = round_id
+        self.ttl = ttl
+        self.table = LeaseTable(os.path.join(shared_dir, "leases.db"))
+        self.round_dir = os.path.join(shared_dir, f"round_{round_id}")
+        os.makedirs(self.round_dir, exist_ok=True)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.ttl / 3):
+            try:
+                self.table.heartbeat(self.worker_id, self.round_id, self.ttl)
+            except sqlite3.Error as e:
+                logging.warning(f"Heartbeat failed for {self.worker_id}: {e}")
+
+    def start(self):
+        """Register the worker and start heartbeating in the background."""
+        self.table.heartbeat(self.worker_id, self.round_id, self.ttl)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop heartbeating."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def source_file(self, prefix, source, extension):
+        """Return the path of one source's output file in this round's directory."""
+        return os.path.join(self.round_dir, f"{prefix}_{hash_key(source):016x}{extension}")
+
+    def claim_sources(self, sources):
+        """Yield the sources this worker should scrape, one at a time.
+
+        Ownership comes from the hash ring over live workers. The loop keeps
+        running until every source in the round is done, so sources owned
+        by a worker whose heartbeat stops are taken over by the survivors.
+        A source is marked done when the caller asks for the next one, so
+        the caller must write the source's output (see ``source_file``)
+        before then; a worker that dies mid-source leaves it to be redone.
+        """
+        while True:
+            done = self.table.done_sources(self.round_id)
+            pending = [source for source in sources if source not in done]
+            if not pending:
+                return
+            ring = HashRing(self.table.live_workers(self.round_id, self.ttl) or [self.worker_id])
+            progressed = False
+            for source in pending:
+                if ring.owner(source) != self.worker_id:
+                    continue
+                if self.table.acquire(self.round_id, source, self.worker_id, self.ttl):
+                    yield source
+                    self.table.mark_done(self.round_id, source, self.worker_id)
+                    progressed = True
+            if not progressed:
+                time.sleep(self.ttl / 3)  # Wait for other workers to finish or expire
+
+    def round_complete(self, sources):
+        """Return True if every source in this round has been scraped and the outputs merged.
+
+        A round whose sources are done but whose merge never ran (say the
+        last worker crashed) is not complete: a worker joining it claims
+        nothing and just performs the merge.
+        """
+        done = self.table.done_sources(self.round_id)
+        return MERGE_LEASE in done and all(source in done for source in sources)
+
+    def finish(self, merged_file, quota=0):
+        """Mark this worker finished and merge all outputs if it is the last one."""
+        self.stop()
+        self.table.mark_finished(self.worker_id, self.round_id)
+        if self.table.live_workers(self.round_id, self.ttl):
+            return None
+        if not self.table.acquire(self.round_id, MERGE_LEASE, self.worker_id, self.ttl):
+            return None
+        count = merge_worker_outputs(glob.glob(os.path.join(self.round_dir, "news_*.csv")), merged_file,
+                                     glob.glob(os.path.join(self.round_dir, "extra_*.csv")), quota)
+        self.table.mark_done(self.round_id, MERGE_LEASE, self.worker_id)
+        logging.info(f"Merged {count} unique articles into {merged_file}")
+        return merged_file
+
+# --- Output Merging ---
+def read_worker_csv(filename):
+    """Return (header, rows) from a worker CSV file."""
+    with open(filename, newline="", encoding="utf-8") as file:
+        reader = csv.reader(file)
+        return next(reader, None), list(reader)
+
+def merge_worker_outputs(filenames, output_file, extra_filenames=(), quota=0):
+    """Merge per-worker CSV files into one file, dropping duplicate links.
+
+    If fewer than ``quota`` rows result, unfiltered rows from
+    ``extra_filenames`` are added to make up the difference.
+    """
+    seen = set()
+    header = None
+    rows = []
+    extras = []
+    for filename, target in ([(name, rows) for name in sorted(filenames)]
+                             + [(name, extras) for name in sorted(extra_filenames)]):
+        if os.path.abspath(filename) == os.path.abspath(output_file):
+            continue
+        file_header, file_rows = read_worker_csv(filename)
+        if file_header is None:
+            continue
+        header = header or file_header
+        link_index = file_header.index("Link")
+        for row in file_rows:
+            if row[link_index] not in seen:
+                seen.add(row[link_index])
+                target.append(row)
+    if len(rows) < quota:
+        logging.warning(f"Fewer than {quota} articles found. Adding unfiltered articles to meet the quota.")
+        rows += extras[:quota - len(rows)]
+    with open(output_file, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        if header:
+            writer.writerow(header)
+        writer.writerows(rows)
+    return len(rows)
+
+# --- Local Launcher ---
+def launch_local_workers(count, shared_dir, round_id, script="scraper.py"):
+    """Run ``count`` scraper processes against one shared directory and wait for them."""
+    os.makedirs(shared_dir, exist_ok=True)
+    processes = [
+        subprocess.Popen([sys.executable, script, "--worker-id", f"worker{i}",
+                          "--shared-dir", shared_dir, "--round", round_id])
+        for i in range(count)
+    ]
+    return [process.wait() for process in processes]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run several sharded News Sentinel workers locally.")
+    parser.add_argument("workers", type=int, help="Number of worker processes")
+    parser.add_argument("--shared-dir", default="shared", help="Directory shared by all workers")
+    parser.add_argument("--round", default=time.strftime("%Y%m%d_%H%M%S"), help="Run identifier")
+    args = parser.parse_args()
+    exit_codes = launch_local_workers(args.workers, args.shared_dir, args.round)
+    print(f"Workers finished with exit codes: {exit_codes}")
@@ -0,0 +1,151 @@
+import json
+import logging
+import os
+import time
+
+import requests
+
+API_BASE_URL = "https://api.twitter.com/2"
+
+def load_twitter_bearer_token(config):
+    """Read the bearer token from the environment, then from config.json."""
+    return os.environ.get("TWITTER_BEARER_TOKEN") or config.get("TWITTER", {}).get("BEARER_TOKEN")
+
+# --- Persistent Watermarks ---
+def load_watermarks(filename="social_watermarks.json"):
+    """Load the newest tweet ID and user ID seen for each account."""
+    try:
+        with open(filename, "r") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        logging.info(f"{filename} not found. Starting fresh.")
+        return {}
+
+def save_watermarks(watermarks, filename="social_watermarks.json"):
+    """Save per-account watermarks to a JSON file."""
+    with open(filename, "w") as file:
+        json.dump(watermarks, file, indent=4)
+
+def watermark_progress(state):
+    """Sort key for how far an account's watermark has got, for picking the newest of several copies.
+
+    Reaching a tweet counts for more than a pending backfill behind it, and
+    a backfill that reached further back counts for more than one that didn't.
+    """
+    backfill = state.get("backfill")
+    if not backfill:
+        return int(state.get("since_id") or 0), 1, 0
+    return int(backfill["newest_id"]), 0, -int(backfill["until_id"])
+
+class SocialTimelineSource:
+    """Poll account timelines incrementally, pulling only tweets newer than the last poll.
+
+    Each account keeps a ``since_id`` watermark. Requests are paced from the
+    x-rate-limit-* response headers so the remaining quota is spread over
+    the rest of the rate-limit window instead of being burned at once. A
+    429 without a reset time backs off exponentially from ``backoff``
+    seconds, or for as long as its Retry-After header asks.
+    """
+
+    def __init__(self, bearer_token, watermarks, base_url=API_BASE_URL, max_results=100,
+                 max_pages=5, session=None, sleep=time.sleep, backoff=15):
+        self.base_url = base_url.rstrip("/")
+        self.watermarks = watermarks
+        self.max_results = max_results
+        self.max_pages = max_pages
+        self.session = session or requests.Session()
+        self.session.headers["Authorization"] = f"Bearer {bearer_token}"
+        self.sleep = sleep
+        self.backoff = backoff
+        self.remaining = None
+        self.reset_at = None
+
+    def _pace(self):
+        """Wait long enough to spread the remaining quota over the current window."""
+        if self.remaining is None or self.reset_at is None:
+            return
+        window = max(0.0, self.reset_at - time.time())
+        if self.remaining <= 0:
+            delay = window
+        else:
+            delay = window / (self.remaining + 1)
+        if delay > 0:
+            self.sleep(delay)
+
+    def _get(self, path, params=None, retries=3):
+        """GET an API path, honouring the rate-limit headers."""
+        for attempt in range(retries):
+            self._pace()
+            response = self.session.get(f"{self.base_url}{path}", params=params, timeout=10)
+            if "x-rate-limit-remaining" in response.headers:
+                self.remaining = int(response.headers["x-rate-limit-remaining"])
+                self.reset_at = float(response.headers.get("x-rate-limit-reset", time.time()))
+            if response.status_code == 429:
+                self.remaining = 0
+                if "x-rate-limit-reset" not in response.headers:
+                    retry_after = response.headers.get("retry-after", "")
+                    delay = float(retry_after) if retry_after.isdigit() else self.backoff * 2 ** attempt
+                    self.reset_at = time.time() + delay
+                logging.warning(f"Rate limited on {path} (attempt {attempt + 1}/{retries}).")
+                continue
+            response.raise_for_status()
+            return response.json()
+        raise RuntimeError(f"Still rate limited after {retries} attempts: {path}")
+
+    def _user_id(self, handle):
+        """Resolve a handle to a user ID, caching it with the watermark."""
+        state = self.watermarks.setdefault(handle, {})
+        if not state.get("user_id"):
+            state["user_id"] = self._get(f"/users/by/username/{handle}")["data"]["id"]
+        return state["user_id"]
+
+    def fetch_new(self, handle):
+        """Return tweets posted by an account since the last poll, newest first.
+
+        If ``max_pages`` runs out before the watermark is reached, the
+        unread stretch is kept as a backfill (read up to ``until_id``) and
+        finished on the next poll; ``since_id`` only moves once it is read.
+        """
+        state = self.watermarks.setdefault(handle, {})
+        backfill = state.get("backfill")
+        params = {"max_results": self.max_results, "tweet.fields": "created_at"}
+        if state.get("since_id"):
+            params["since_id"] = state["since_id"]
+        if backfill:
+            params["until_id"] = backfill["until_id"]
+        tweets = []
+        newest_id = None
+        for _ in range(self.max_pages):
+            payload = self._get(f"/users/{self._user_id(handle)}/tweets", params)
+            meta = payload.get("meta", {})
+            newest_id = newest_id or meta.get("newest_id")
+            tweets.extend(payload.get("data", []))
+            # Without a watermark, one page is enough; don't walk the whole history
+            if not state.get("since_id") or not meta.get("next_token"):
+                break
+            params["pagination_token"] = meta["next_token"]
+        else:
+            newest_id = backfill["newest_id"] if backfill else newest_id
+            state["backfill"] = {"until_id": meta.get("oldest_id") or tweets[-1]["id"], "newest_id": newest_id}
+            logging.warning(f"@{handle} has more new tweets than {self.max_pages} pages; "
+                            f"reading the rest, older than {state['backfill']['until_id']}, next poll.")
+            return tweets
+        if backfill:
+            newest_id = backfill["newest_id"]
+            del state["backfill"]
+        if newest_id:
+            state["since_id"] = newest_id
+        return tweets
+
+    def fetch_entries(self, handle):
+        """Return new tweets as feed-style entries for the article pipeline."""
+        entries = []
+        for tweet in self.fetch_new(handle):
+            link = f"https://twitter.com/{handle}/status/{tweet['id']}"
+            entries.append({
+                "title": " ".join(tweet.get("text", "").split()),
+                "link": link,
+                "id": link,
+                "published": tweet.get("created_at", "")
+            })
+        return entries
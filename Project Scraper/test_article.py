@@ -0,0 +1,15 @@
+from article import Article, article_id, unique_articles
+
+def test_tracking_parameters_are_ignored():
+    base = article_id("https://example.com/story")
+    assert article_id("https://Example.com/story/?utm_source=x&utm_medium=y") == base
+    assert article_id("https://example.com/story?ref=homepage&fbclid=abc&gclid=1&CMPID=2#top") == base
+
+def test_parameters_that_only_share_a_prefix_are_kept():
+    assert article_id("https://example.com/p?reference=1") != article_id("https://example.com/p?reference=2")
+    assert article_id("https://example.com/p?refresh=1") != article_id("https://example.com/p")
+
+def test_unique_articles_keeps_the_first_of_each_link():
+    articles = [Article("A", "https://example.com/a", "X"), Article("A again", "https://example.com/a/", "Y"),
+                Article("B", "https://example.com/a?reference=2", "X")]
+    assert [article.title for article in unique_articles(articles)] == ["A", "B"]
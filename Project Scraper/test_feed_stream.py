@@ -0,0 +1,23 @@
+import feedparser
+
+from feed_stream import feedparser_entries, parse_feed_stream, parse_published
+
+RSS1 = b"""<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/"
+    xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:media="http://search.yahoo.com/mrss/">
+<item><title>Real title</title><media:title>Thumbnail</media:title><link>https://example.com/a</link>
+<dc:date>2024-12-20T18:00:00Z</dc:date></item>
+</rdf:RDF>"""
+
+def test_dc_date_is_read_as_publish_date():
+    [entry] = parse_feed_stream([RSS1])
+    assert entry["title"] == "Real title"
+    assert parse_published(entry["published"]) == 1734717600.0
+
+def test_feedparser_fallback_reads_dc_date():
+    [entry] = feedparser_entries(feedparser.parse(RSS1))
+    assert parse_published(entry["published"]) == 1734717600.0
+
+def test_rfc822_and_missing_dates():
+    assert parse_published("Fri, 20 Dec 2024 18:00:00 +0000") == 1734717600.0
+    assert parse_published("") is None
+    assert parse_published("sometime") is None
@@ -0,0 +1,65 @@
+import csv
+import multiprocessing
+import os
+import time
+
+from shard_coordinator import ShardWorker, merge_worker_outputs
+
+ROUND = "r1"
+SOURCES = [f"source{i}" for i in range(20)]
+
+def write_source(worker, source):
+    with open(worker.source_file("news", source, ".csv"), "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Source", "Title", "Link", "Keywords Used"])
+        writer.writerow([source, f"{source} story", f"https://example.com/{source}", ""])
+
+def run_worker(shared_dir, worker_id, die_after=None):
+    """Scrape this worker's share of SOURCES; with ``die_after``, crash mid-way through the next source."""
+    worker = ShardWorker(worker_id, shared_dir, ROUND, ttl=1)
+    worker.start()
+    for count, source in enumerate(worker.claim_sources(SOURCES)):
+        if count == die_after:
+            os._exit(1)  # Dies holding this source's lease, without any cleanup
+        write_source(worker, source)
+        time.sleep(0.05)
+    worker.finish(os.path.join(shared_dir, f"news_{ROUND}_merged.csv"))
+
+def read_column(filename, column):
+    with open(filename, newline="", encoding="utf-8") as file:
+        return [row[column] for row in csv.DictReader(file)]
+
+def test_sources_of_a_killed_worker_are_not_lost(tmp_path):
+    shared_dir = str(tmp_path)
+    processes = [multiprocessing.Process(target=run_worker, args=(shared_dir, f"worker{i}", 2 if i == 0 else None))
+                 for i in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+    assert processes[0].exitcode == 1
+    assert [process.exitcode for process in processes[1:]] == [0, 0]
+    assert sorted(read_column(os.path.join(shared_dir, f"news_{ROUND}_merged.csv"), "Source")) == sorted(SOURCES)
+
+def test_rounds_sharing_a_prefix_are_kept_apart(tmp_path):
+    day = ShardWorker("worker0", str(tmp_path), "20241220")
+    launcher = ShardWorker("worker0", str(tmp_path), "20241220_093000")
+    write_source(day, "source0")
+    write_source(launcher, "source1")
+    day.table.heartbeat("worker0", "20241220", day.ttl)
+    assert day.finish(str(tmp_path / "news_20241220_merged.csv"))
+    assert read_column(tmp_path / "news_20241220_merged.csv", "Source") == ["source0"]
+
+def test_merge_tops_up_to_quota_from_extras(tmp_path):
+    def write(name, links):
+        with open(tmp_path / name, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["Source", "Title", "Link", "Keywords Used"])
+            writer.writerows([["S", link, link, ""] for link in links])
+    write("news_a.csv", ["l1", "l2"])
+    write("news_b.csv", ["l2"])
+    write("extra_a.csv", ["l1", "l3", "l4"])
+    count = merge_worker_outputs([tmp_path / "news_a.csv", tmp_path / "news_b.csv"], tmp_path / "merged.csv",
+                                 [tmp_path / "extra_a.csv"], quota=3)
+    assert count == 3
+    assert read_column(tmp_path / "merged.csv", "Link") == ["l1", "l2", "l3"]
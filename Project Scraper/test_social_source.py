@@ -0,0 +1,133 @@
+import pytest
+
+import social_source
+from social_source import SocialTimelineSource
+
+NOW = 1_700_000_000.0
+
+class StubResponse:
+    def __init__(self, payload=None, status_code=200, headers=None):
+        self.payload = payload or {}
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return self.payload
+
+class StubSession:
+    """Answers API calls from a list of queued responses, recording each request."""
+
+    def __init__(self, responses):
+        self.headers = {}
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append((url, dict(params or {})))
+        return self.responses.pop(0)
+
+def make_source(responses, watermarks=None, **kwargs):
+    delays = []
+    session = StubSession(responses)
+    source = SocialTimelineSource("token", watermarks if watermarks is not None else {},
+                                  base_url="https://api.test/2", session=session, sleep=delays.append, **kwargs)
+    return source, session, delays
+
+def user(user_id="42"):
+    return StubResponse({"data": {"id": user_id}})
+
+def page(ids, next_token=None):
+    meta = {"newest_id": ids[0]} if ids else {}
+    if next_token:
+        meta["next_token"] = next_token
+    return StubResponse({"data": [{"id": i, "text": f"tweet {i}"} for i in ids], "meta": meta})
+
+@pytest.fixture(autouse=True)
+def frozen_time(monkeypatch):
+    monkeypatch.setattr(social_source.time, "time", lambda: NOW)
+
+def test_since_id_advances_to_newest_tweet():
+    watermarks = {}
+    source, session, _ = make_source([user(), page(["103", "102"]), page(["105", "104"])], watermarks)
+    assert [tweet["id"] for tweet in source.fetch_new("alice")] == ["103", "102"]
+    assert watermarks["alice"] == {"user_id": "42", "since_id": "103"}
+    assert [tweet["id"] for tweet in source.fetch_new("alice")] == ["105", "104"]
+    assert session.calls[-1][1]["since_id"] == "103"
+    assert watermarks["alice"]["since_id"] == "105"
+
+def test_no_new_tweets_keeps_watermark():
+    watermarks = {"alice": {"user_id": "42", "since_id": "103"}}
+    source, _, _ = make_source([page([])], watermarks)
+    assert source.fetch_new("alice") == []
+    assert watermarks["alice"]["since_id"] == "103"
+
+def test_pagination_follows_next_token_until_exhausted():
+    watermarks = {"alice": {"user_id": "42", "since_id": "100"}}
+    source, session, _ = make_source([page(["110", "109"], "t1"), page(["108"], "t2"), page(["107"])], watermarks)
+    assert [tweet["id"] for tweet in source.fetch_new("alice")] == ["110", "109", "108", "107"]
+    assert [params.get("pagination_token") for _, params in session.calls] == [None, "t1", "t2"]
+    assert watermarks["alice"]["since_id"] == "110"
+
+def test_pagination_stops_at_max_pages_and_backfills_next_poll():
+    watermarks = {"alice": {"user_id": "42", "since_id": "100"}}
+    responses = [page(["110"], "t1"), page(["109"], "t2"),   # First poll runs out of pages
+                 page(["108"], "t3"), page(["107"]),         # Second poll reads the rest of the gap
+                 page(["112", "111"])]                       # Third poll picks up newer tweets
+    source, session, _ = make_source(responses, watermarks, max_pages=2)
+    assert [tweet["id"] for tweet in source.fetch_new("alice")] == ["110", "109"]
+    assert watermarks["alice"]["since_id"] == "100"
+    assert watermarks["alice"]["backfill"] == {"until_id": "109", "newest_id": "110"}
+
+    assert [tweet["id"] for tweet in source.fetch_new("alice")] == ["108", "107"]
+    assert session.calls[2][1]["until_id"] == "109" and session.calls[2][1]["since_id"] == "100"
+    assert watermarks["alice"] == {"user_id": "42", "since_id": "110"}
+
+    assert [tweet["id"] for tweet in source.fetch_new("alice")] == ["112", "111"]
+    assert "until_id" not in session.calls[4][1]
+    assert watermarks["alice"]["since_id"] == "112"
+
+def test_first_poll_reads_only_one_page():
+    source, session, _ = make_source([user(), page(["110"], "t1")])
+    source.fetch_new("alice")
+    assert len(session.calls) == 2
+
+def test_requests_are_paced_from_rate_limit_headers():
+    headers = {"x-rate-limit-remaining": "4", "x-rate-limit-reset": str(NOW + 100)}
+    watermarks = {"alice": {"user_id": "42"}}
+    source, _, delays = make_source([StubResponse(page(["1"]).payload, headers=headers), page(["2"])], watermarks)
+    source.fetch_new("alice")
+    assert delays == []
+    source.fetch_new("alice")
+    assert delays == [pytest.approx(20.0)]  # 100s left, spread over the 4 remaining requests and the reset
+
+def test_rate_limited_request_waits_for_reset_and_retries():
+    headers = {"x-rate-limit-remaining": "0", "x-rate-limit-reset": str(NOW + 30)}
+    watermarks = {"alice": {"user_id": "42"}}
+    source, session, delays = make_source([StubResponse(status_code=429, headers=headers), page(["1"])], watermarks)
+    assert [tweet["id"] for tweet in source.fetch_new("alice")] == ["1"]
+    assert delays == [pytest.approx(30.0)]
+    assert len(session.calls) == 2
+
+def test_rate_limited_request_without_reset_backs_off():
+    watermarks = {"alice": {"user_id": "42"}}
+    responses = [StubResponse(status_code=429), StubResponse(status_code=429), page(["1"])]
+    source, _, delays = make_source(responses, watermarks, backoff=5)
+    source.fetch_new("alice")
+    assert delays == [pytest.approx(5.0), pytest.approx(10.0)]
+
+def test_rate_limited_request_honours_retry_after():
+    watermarks = {"alice": {"user_id": "42"}}
+    responses = [StubResponse(status_code=429, headers={"retry-after": "7"}), page(["1"])]
+    source, _, delays = make_source(responses, watermarks)
+    source.fetch_new("alice")
+    assert delays == [pytest.approx(7.0)]
+
+def test_rate_limit_that_never_clears_raises():
+    watermarks = {"alice": {"user_id": "42"}}
+    source, _, _ = make_source([StubResponse(status_code=429)] * 3, watermarks)
+    with pytest.raises(RuntimeError):
+        source.fetch_new("alice")
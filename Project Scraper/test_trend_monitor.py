@@ -0,0 +1,48 @@
+from trend_monitor import TrendMonitor
+
+HOUR = 3600
+DAY = 24 * HOUR
+START = 1_700_000_000
+
+def daily_run(monitor, day, per_source, undated=False):
+    """Observe one day's articles for "police", spread over the day, and check at its end."""
+    now = START + (day + 1) * DAY
+    events = []
+    for source, count in per_source.items():
+        for i in range(count):
+            published = None if undated else now - DAY + (i + 0.5) * DAY / count
+            events.append((["police"], source, published))
+    return monitor.observe_run(events, now)
+
+def steady_monitor(days=28, undated=False):
+    monitor = TrendMonitor(started=START)
+    for day in range(days):
+        bursts = daily_run(monitor, day, {"A": 6, "B": 6}, undated)
+        assert bursts == [] or (day + 1) * DAY < monitor.warmup
+    return monitor
+
+def test_steady_traffic_raises_no_bursts():
+    monitor = steady_monitor()
+    assert daily_run(monitor, 28, {"A": 6, "B": 6}) == []
+
+def test_steady_undated_traffic_raises_no_bursts():
+    monitor = steady_monitor(undated=True)
+    assert daily_run(monitor, 28, {"A": 6, "B": 6}, undated=True) == []
+
+def test_spike_is_flagged_per_outlet_and_across_outlets():
+    monitor = steady_monitor()
+    bursts = daily_run(monitor, 28, {"A": 40, "B": 40})
+    flagged = {(burst["keyword"], burst["source"]) for burst in bursts}
+    assert flagged == {("police", "A"), ("police", "B"), ("police", None)}
+
+def test_spike_spread_across_outlets_is_flagged_across_outlets_only():
+    monitor = TrendMonitor(started=START)
+    for day in range(28):
+        daily_run(monitor, day, {"A": 1})
+    # Each new outlet stays under min_count on its own; together they are a burst
+    bursts = daily_run(monitor, 28, {"A": 1, **{f"S{i}": 2 for i in range(10)}})
+    assert [(burst["keyword"], burst["source"]) for burst in bursts] == [("police", None)]
+
+def test_warmup_suppresses_bursts():
+    monitor = TrendMonitor(started=START)
+    assert daily_run(monitor, 0, {"A": 40, "B": 40}) == []
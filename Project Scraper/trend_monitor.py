@@ -0,0 +1,174 @@
+import hashlib
+import json
+import logging
+import math
+import time
+from array import array
+
+class DecayedCountMinSketch:
+    """Count-min sketch whose counts decay exponentially with a given half-life.
+
+    Uses forward decay: an event at time ``t`` is added with weight
+    ``exp(rate * (t - landmark))`` and queries divide by the same factor
+    at query time, so no cell has to be touched to age the counts. The
+    landmark is moved forward before the weights get large enough to
+    overflow. Memory is ``width * depth`` floats, however many keys
+    are counted.
+    """
+
+    def __init__(self, half_life, width=2048, depth=4, landmark=None, cells=None):
+        self.half_life = half_life
+        self.rate = math.log(2) / half_life
+        self.width = width
+        self.depth = depth
+        self.landmark = landmark  # Set by the first event
+        self.cells = array("d", cells if cells is not None else [0.0] * (width * depth))
+
+    def _indexes(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [row * self.width + (h1 + row * h2) % self.width for row in range(self.depth)]
+
+    def _rebase(self, now):
+        """Move the landmark to ``now`` once weights grow large."""
+        if self.landmark is None:
+            self.landmark = now
+            return
+        exponent = self.rate * (now - self.landmark)
+        if exponent > 50:
+            scale = math.exp(-exponent)
+            for i in range(len(self.cells)):
+                self.cells[i] *= scale
+            self.landmark = now
+
+    def add(self, key, timestamp, count=1.0):
+        """Count an event for a key at a timestamp."""
+        self._rebase(timestamp)
+        weight = count * math.exp(self.rate * (timestamp - self.landmark))
+        for index in self._indexes(key):
+            self.cells[index] += weight
+
+    def estimate(self, key, now):
+        """Return the decayed count for a key as of ``now`` (never an underestimate)."""
+        if self.landmark is None:
+            return 0.0
+        value = min(self.cells[index] for index in self._indexes(key))
+        return value * math.exp(-self.rate * max(0.0, now - self.landmark))
+
+    def to_dict(self):
+        return {"half_life": self.half_life, "width": self.width, "depth": self.depth,
+                "landmark": self.landmark, "cells": list(self.cells)}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["half_life"], data["width"], data["depth"], data["landmark"], data["cells"])
+
+class TrendMonitor:
+    """Flag keyword bursts by comparing a short-horizon rate with a long-horizon baseline.
+
+    Counts per keyword and per keyword x source go into two decayed
+    sketches: a short half-life for "now" and a long one for the rolling
+    baseline. A decayed count divided by ``half_life / ln 2`` estimates an
+    event rate, so the two horizons can be compared directly.
+
+    Scrapes happen in batches, so ``observe_run`` counts each article at
+    its publish time, or spreads undated ones across the interval since
+    the previous check; stamping a whole batch with the run time would
+    make steady traffic look like a burst.
+    """
+
+    def __init__(self, short_half_life=6 * 3600, long_half_life=7 * 86400, burst_ratio=3.0,
+                 min_count=3.0, warmup=None, width=2048, depth=4, started=None, last_check=None):
+        self.short = DecayedCountMinSketch(short_half_life, width, depth)
+        self.long = DecayedCountMinSketch(long_half_life, width, depth)
+        self.burst_ratio = burst_ratio
+        self.min_count = min_count
+        # Until the baseline has built up over about one long half-life, everything looks like a burst
+        self.warmup = warmup if warmup is not None else long_half_life
+        self.started = started if started is not None else time.time()
+        self.last_check = last_check
+        self.pending = set()  # (keyword, source) pairs observed since the last check
+
+    def observe(self, keyword, source, timestamp):
+        """Count one article matching a keyword from a source."""
+        for key in (f"kw:{keyword}", f"kw:{keyword}|src:{source}"):
+            self.short.add(key, timestamp)
+            self.long.add(key, timestamp)
+        self.pending.add((keyword, source))
+
+    def observe_run(self, events, now=None):
+        """Count a run's new articles as (keywords, source, published) events, then check.
+
+        ``published`` is epoch seconds or None. Returns the bursts from ``check``.
+        """
+        now = now if now is not None else time.time()
+        since = self.last_check if self.last_check is not None else now - self.short.half_life
+        undated = [event for event in events if event[2] is None]
+        step = (now - since) / (len(undated) + 1)
+        spread = iter(since + step * (i + 1) for i in range(len(undated)))
+        for keywords, source, published in events:
+            timestamp = min(published, now) if published is not None else next(spread)
+            for keyword in keywords:
+                self.observe(keyword, source, timestamp)
+        return self.check(now)
+
+    def _rates(self, key, now):
+        short_count = self.short.estimate(key, now)
+        short_rate = short_count * self.short.rate
+        long_rate = self.long.estimate(key, now) * self.long.rate
+        return short_count, short_rate, long_rate
+
+    def check(self, now=None):
+        """Return bursts among recently observed keys, strongest first."""
+        now = now if now is not None else time.time()
+        candidates, self.pending = self.pending, set()
+        self.last_check = now
+        if now - self.started < self.warmup:
+            return []
+        keys = {(keyword, None) for keyword, _ in candidates} | candidates
+        bursts = []
+        for keyword, source in keys:
+            key = f"kw:{keyword}" if source is None else f"kw:{keyword}|src:{source}"
+            short_count, short_rate, long_rate = self._rates(key, now)
+            if short_count < self.min_count:
+                continue
+            ratio = short_rate / long_rate if long_rate else math.inf
+            if ratio >= self.burst_ratio:
+                bursts.append({"keyword": keyword, "source": source, "count": round(short_count, 1),
+                               "ratio": round(ratio, 2)})
+        bursts.sort(key=lambda burst: burst["ratio"], reverse=True)
+        return bursts
+
+    def to_dict(self):
+        return {"short": self.short.to_dict(), "long": self.long.to_dict(), "burst_ratio": self.burst_ratio,
+                "min_count": self.min_count, "warmup": self.warmup, "started": self.started,
+                "last_check": self.last_check}
+
+    @classmethod
+    def from_dict(cls, data):
+        monitor = cls(burst_ratio=data["burst_ratio"], min_count=data["min_count"],
+                      warmup=data["warmup"], started=data["started"], last_check=data.get("last_check"))
+        monitor.short = DecayedCountMinSketch.from_dict(data["short"])
+        monitor.long = DecayedCountMinSketch.from_dict(data["long"])
+        return monitor
+
+# --- Persistent Trend State ---
+def load_trend_monitor(filename="trend_state.json", **settings):
+    """Load the trend monitor state, or start a new monitor with the given settings."""
+    try:
+        with open(filename, "r") as file:
+            monitor = TrendMonitor.from_dict(json.load(file))
+    except FileNotFoundError:
+        logging.info(f"{filename} not found. Starting fresh.")
+        return TrendMonitor(**settings)
+    # Thresholds can change between runs; the sketch half-lives are fixed once counted
+    for name in ("burst_ratio", "min_count", "warmup"):
+        if name in settings:
+            setattr(monitor, name, settings[name])
+    return monitor
+
+def save_trend_monitor(monitor, filename="trend_state.json"):
+    """Save the trend monitor state to a JSON file."""
+    with open(filename, "w") as file:
+        json.dump(monitor.to_dict(), file)
@@ -0,0 +1,269 @@
+import json
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, so one process per journal
+    fcntl = None
+
+INCOMPLETE = "Incomplete"
+QUEUED = "Queued"
+CLAIMED = "Claimed"
+COMPLETE = "Complete"
+FAILED = "Failed"
+
+class JobStore:
+    """Task and scrape-job store backed by an append-only journal.
+
+    Every state change is appended to the journal as one JSON line, so a
+    status update costs one small write instead of rewriting the file. The
+    in-memory index is rebuilt from the journal on first use, and
+    ``compact`` rewrites the journal down to one line per job.
+
+    Several processes can share a journal: every operation holds an
+    exclusive lock on ``<journal>.lock`` and first applies whatever the
+    other processes appended since, so two workers never claim the same
+    job. Each record reaches the OS before the lock is released; the
+    journal is fsynced every ``fsync_every`` records.
+    """
+
+    def __init__(self, journal_file="jobs.journal", fsync_every=64, compact_after=10000):
+        self.journal_file = journal_file
+        self.fsync_every = fsync_every
+        self.compact_after = compact_after
+        self._jobs = None       # job -> {"status", "source", "worker"}
+        self._queues = {}       # source -> deque of job ids waiting to be claimed
+        self._journal = None
+        self._lock = None
+        self._offset = 0        # Bytes of the journal applied to the index
+        self._unsynced = 0
+        self._journal_lines = 0
+
+    # --- Locking ---
+    @contextmanager
+    def _locked(self):
+        """Hold the journal lock and bring the index up to date with other processes."""
+        if self._lock is None:
+            self._lock = open(self.journal_file + ".lock", "a")
+        if fcntl:
+            fcntl.flock(self._lock, fcntl.LOCK_EX)
+        try:
+            self._load()
+            self._catch_up()
+            yield
+        finally:
+            if self._journal is not None:
+                self._journal.flush()
+            if fcntl:
+                fcntl.flock(self._lock, fcntl.LOCK_UN)
+
+    def _catch_up(self):
+        """Apply records other processes appended since we last looked."""
+        try:
+            replaced = os.stat(self.journal_file).st_ino != os.fstat(self._journal.fileno()).st_ino
+        except FileNotFoundError:
+            replaced = True
+        with open(self.journal_file, "rb") as file:
+            file.seek(self._offset)
+            data = b"" if replaced else file.read()
+        if replaced or (data and not data.endswith(b"\n")):
+            # Compacted by another process, or it crashed mid-write: rebuild from scratch
+            self._journal.close()
+            self._jobs = None
+            self._load()
+            return
+        for line in data.splitlines():
+            if line.strip():
+                self._apply(json.loads(line))
+                self._journal_lines += 1
+        self._offset += len(data)
+
+    # --- Index ---
+    def _load(self):
+        """Replay the journal into the in-memory index (only once)."""
+        if self._jobs is not None:
+            return
+        self._jobs = {}
+        self._queues = {}
+        self._journal_lines = 0
+        try:
+            with open(self.journal_file, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            data = b""
+
+        lines = data.split(b"\n")
+        offset = 0
+        truncate_at = None
+        for number, line in enumerate(lines, start=1):
+            start, offset = offset, offset + len(line) + 1
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                if not any(rest.strip() for rest in lines[number:]):
+                    # Torn write from a crash: cut it off so the next append starts on a clean line
+                    logging.warning(f"Dropping torn final line of {self.journal_file}.")
+                    truncate_at = start
+                    break
+                logging.error(f"Skipping corrupt line {number} of {self.journal_file}.")
+                continue
+            self._apply(record)
+            self._journal_lines += 1
+
+        if truncate_at is not None:
+            with open(self.journal_file, "r+b") as file:
+                file.truncate(truncate_at)
+                file.flush()
+                os.fsync(file.fileno())
+            data = data[:truncate_at]
+        self._journal = open(self.journal_file, "a", encoding="utf-8")
+        self._offset = len(data)
+        if data and not data.endswith(b"\n"):
+            self._journal.write("\n")  # Last record was complete but its newline never made it
+            self._offset += 1
+
+    def _apply(self, record):
+        """Apply one journal record to the index."""
+        job = record["job"]
+        entry = self._jobs.get(job)
+        if entry is None:
+            entry = self._jobs[job] = {"status": INCOMPLETE, "source": "", "worker": ""}
+        if "source" in record:
+            entry["source"] = record["source"]
+        entry["status"] = record["status"]
+        entry["worker"] = record.get("worker", "")
+        if entry["status"] == QUEUED:
+            self._queues.setdefault(entry["source"], deque()).append(job)
+
+    def _write(self, record):
+        """Append a record to the journal and apply it to the index (call with the lock held)."""
+        record["ts"] = round(time.time(), 3)
+        line = json.dumps(record) + "\n"  # ASCII-only, so characters == bytes
+        self._journal.write(line)
+        self._offset += len(line)
+        self._apply(record)
+        self._journal_lines += 1
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self._sync()
+        if self._journal_lines >= self.compact_after and self._journal_lines > 2 * len(self._jobs):
+            self._compact()
+
+    def _sync(self):
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._unsynced = 0
+
+    # --- Public API ---
+    def add(self, job, source="", status=INCOMPLETE):
+        """Add a job (or reset an existing one) with the given status.
+
+        Raises ValueError if the job is currently claimed by a worker.
+        """
+        with self._locked():
+            entry = self._jobs.get(job)
+            if entry and entry["status"] == CLAIMED:
+                raise ValueError(f"Job {job!r} is claimed by {entry['worker'] or 'a worker'} and can't be reset.")
+            self._write({"job": job, "source": source, "status": status})
+
+    def set_status(self, job, status, worker=""):
+        """Change the status of an existing job."""
+        with self._locked():
+            if job not in self._jobs:
+                raise KeyError(job)
+            self._write({"job": job, "status": status, "worker": worker})
+
+    def enqueue(self, source, job=None):
+        """Queue a scrape job for a source and return its id."""
+        job = job or f"{source}@{time.strftime('%Y%m%d_%H%M%S')}-{uuid.uuid4().hex[:12]}"
+        self.add(job, source=source, status=QUEUED)
+        return job
+
+    def claim(self, source=None, worker=""):
+        """Claim the oldest queued job for a source (or any source) and return its id."""
+        with self._locked():
+            sources = [source] if source is not None else list(self._queues)
+            for name in sources:
+                queue = self._queues.get(name)
+                while queue:
+                    job = queue.popleft()
+                    if self._jobs[job]["status"] == QUEUED:  # Skip stale queue entries
+                        self._write({"job": job, "status": CLAIMED, "worker": worker})
+                        return job
+        return None
+
+    def complete(self, job):
+        """Mark a job as complete."""
+        self.set_status(job, COMPLETE)
+
+    def fail(self, job):
+        """Mark a job as failed."""
+        self.set_status(job, FAILED)
+
+    def status(self, job):
+        """Return the status of a job, or None if it is unknown."""
+        with self._locked():
+            entry = self._jobs.get(job)
+        return entry["status"] if entry else None
+
+    def jobs(self, source=None):
+        """Yield (job, status) pairs, optionally limited to one source."""
+        with self._locked():
+            jobs = [(job, entry["status"]) for job, entry in self._jobs.items()
+                    if source is None or entry["source"] == source]
+        yield from jobs
+
+    def flush(self):
+        """Flush pending journal writes to disk."""
+        if self._journal is not None:
+            self._sync()
+
+    def compact(self):
+        """Rewrite the journal with a single record per job."""
+        with self._locked():
+            self._compact()
+
+    def _compact(self):
+        self._sync()
+        temp_file = self.journal_file + ".tmp"
+        with open(temp_file, "w", encoding="utf-8") as file:
+            for job, entry in self._jobs.items():
+                file.write(json.dumps({"job": job, **entry}) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        self._journal.close()
+        os.replace(temp_file, self.journal_file)
+        self._journal = open(self.journal_file, "a", encoding="utf-8")
+        self._journal_lines = len(self._jobs)
+        self._offset = os.path.getsize(self.journal_file)
+
+    def close(self):
+        """Flush and close the journal."""
+        if self._journal is not None:
+            self.flush()
+            self._journal.close()
+            self._journal = None
+        if self._lock is not None:
+            self._lock.close()
+            self._lock = None
+        self._jobs = None
+
+def import_legacy_tasks(store, task_file="tasks.txt"):
+    """Copy ``task,status`` lines from the old tasks.txt format into a store."""
+    count = 0
+    with open(task_file, "r") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            task, status = line.strip().rsplit(",", 1)
+            store.add(task, status=status)
+            count += 1
+    store.flush()
+    return count
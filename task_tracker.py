@@ -1,35 +1,37 @@
+import os
+
+from job_store import JobStore, import_legacy_tasks
+
 # Function to add a task
-def add_task(task_file, task):
-    with open(task_file, "a") as file:
-        file.write(f"{task},Incomplete\n")
+def add_task(store, task):
+    store.add(task)
+    store.flush()
     print(f"Task '{task}' added.")
 
 # Function to view tasks
-def view_tasks(task_file):
+def view_tasks(store):
     print("Your tasks:")
-    with open(task_file, "r") as file:
-        for line in file:
-            task, status = line.strip().split(",")
-            print(f"- {task} [{status}]")
+    for task, status in store.jobs():
+        print(f"- {task} [{status}]")
 
 # Function to mark a task as completed
-def complete_task(task_file, task_to_complete):
-    tasks = []
-    with open(task_file, "r") as file:
-        for line in file:
-            task, status = line.strip().split(",")
-            if task == task_to_complete:
-                tasks.append(f"{task},Complete\n")
-            else:
-                tasks.append(line)
-
-    with open(task_file, "w") as file:
-        file.writelines(tasks)
-
+def complete_task(store, task_to_complete):
+    if store.status(task_to_complete) is None:
+        print(f"Task '{task_to_complete}' not found.")
+        return
+    store.complete(task_to_complete)
+    store.flush()
     print(f"Task '{task_to_complete}' marked as completed.")
 
 # Main program logic
-task_file = "tasks.txt"
+journal_file = "tasks.journal"
+legacy_task_file = "tasks.txt"
+
+first_run = not os.path.exists(journal_file)
+store = JobStore(journal_file)
+if first_run and os.path.exists(legacy_task_file):
+    imported = import_legacy_tasks(store, legacy_task_file)
+    print(f"Imported {imported} tasks from {legacy_task_file}.")
 
 while True:
     print("\nTask Tracker")
@@ -42,13 +44,14 @@ while True:
 
     if choice == "1":
         task = input("Enter the task: ")
-        add_task(task_file, task)
+        add_task(store, task)
     elif choice == "2":
-        view_tasks(task_file)
+        view_tasks(store)
     elif choice == "3":
         task_to_complete = input("Enter the task to mark as completed: ")
-        complete_task(task_file, task_to_complete)
+        complete_task(store, task_to_complete)
     elif choice == "4":
+        store.close()
         print("Goodbye!")
         break
     else:
@@ -0,0 +1,63 @@
+import multiprocessing
+
+from job_store import JobStore, QUEUED, CLAIMED, COMPLETE
+
+def claim_all(journal_file, worker, results):
+    store = JobStore(journal_file)
+    claimed = []
+    while True:
+        job = store.claim(worker=worker)
+        if job is None:
+            break
+        claimed.append(job)
+        store.complete(job)
+    store.close()
+    results.put(claimed)
+
+def test_processes_never_claim_the_same_job(tmp_path):
+    journal_file = str(tmp_path / "jobs.journal")
+    store = JobStore(journal_file)
+    jobs = [store.enqueue(f"source{i % 5}") for i in range(200)]
+    store.close()
+
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=claim_all, args=(journal_file, f"w{i}", results)) for i in range(4)]
+    for process in processes:
+        process.start()
+    claimed = [job for _ in processes for job in results.get(timeout=60)]
+    for process in processes:
+        process.join()
+    assert sorted(claimed) == sorted(jobs)
+    assert {status for _, status in JobStore(journal_file).jobs()} == {COMPLETE}
+
+def test_stores_see_each_others_changes(tmp_path):
+    journal_file = str(tmp_path / "jobs.journal")
+    a, b = JobStore(journal_file, fsync_every=64), JobStore(journal_file, fsync_every=64)
+    job = a.enqueue("feed")
+    assert b.status(job) == QUEUED  # Written to the OS before the fsync batch fills
+    assert b.claim(worker="b") == job
+    assert a.claim(worker="a") is None
+    assert a.status(job) == CLAIMED
+
+def test_compact_keeps_records_from_other_stores(tmp_path):
+    journal_file = str(tmp_path / "jobs.journal")
+    a, b = JobStore(journal_file), JobStore(journal_file)
+    first = a.enqueue("feed")
+    a.complete(first)
+    second = b.enqueue("feed")
+    a.compact()
+    third = b.enqueue("feed")  # b still holds the pre-compaction journal open
+    assert dict(JobStore(journal_file).jobs()) == {first: COMPLETE, second: QUEUED, third: QUEUED}
+
+def test_torn_final_line_is_dropped(tmp_path):
+    journal_file = tmp_path / "jobs.journal"
+    store = JobStore(str(journal_file))
+    job = store.enqueue("feed")
+    store.close()
+    with open(journal_file, "a") as file:
+        file.write('{"job": "half')
+    store = JobStore(str(journal_file))
+    assert dict(store.jobs()) == {job: QUEUED}
+    later = store.enqueue("feed")
+    store.close()
+    assert dict(JobStore(str(journal_file)).jobs()) == {job: QUEUED, later: QUEUED}
@@ -3,13 +3,18 @@ from patched_imghdr import what
 sys.modules['imghdr'] = sys.modules[__name__]
 
 
+import os
 import tweepy
 
-# Twitter API credentials
-TWITTER_API_KEY = "HaA4FDPOUrmzhVLlKT944f7GJ"
-TWITTER_API_SECRET = "9TmlCTKh3UM3W73NgjMN2r3VaL9H6xGzhdIyoMhtxQKzi8VG3A"
-TWITTER_ACCESS_TOKEN = "1854656784717287439-ZsR4woWh4PWAWcHu4KfOH70XnHkyP2"
-TWITTER_ACCESS_SECRET = "FuFEIQ3lY5qccNUxklpvdMzuFvUwytdWYJqPBJJiFq9pA"
+# Twitter API credentials (set these in the environment; never commit them)
+TWITTER_API_KEY = os.environ.get("TWITTER_API_KEY")
+TWITTER_API_SECRET = os.environ.get("TWITTER_API_SECRET")
+TWITTER_ACCESS_TOKEN = os.environ.get("TWITTER_ACCESS_TOKEN")
+TWITTER_ACCESS_SECRET = os.environ.get("TWITTER_ACCESS_SECRET")
+
+if not all([TWITTER_API_KEY, TWITTER_API_SECRET, TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_SECRET]):
+    print("Set TWITTER_API_KEY, TWITTER_API_SECRET, TWITTER_ACCESS_TOKEN and TWITTER_ACCESS_SECRET first.")
+    sys.exit(1)
 
 # Authenticate with Twitter API
 auth = tweepy.OAuthHandler(TWITTER_API_KEY, TWITTER_API_SECRET)